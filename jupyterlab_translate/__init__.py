@@ -1,6 +1,7 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+# Defined first, the submodules use it
+__version__ = "1.3.7"
+
 from .finder import get_installed_language_packs
 from .finder import get_language_pack
-
-__version__ = "1.3.7"
@@ -6,23 +6,22 @@ API interface.
 import os
 from pathlib import Path
 from typing import List
+from typing import Optional
 from typing import Union
 
 from .constants import EXTENSIONS_FOLDER
 from .constants import JUPYTERLAB
 from .constants import LANG_PACKS_FOLDER
-from .constants import LC_MESSAGES
-from .constants import LOCALE_FOLDER
-from .converters import convert_catalog_to_json
-from .utils import check_locale
-from .utils import compile_to_mo
+from .converters import compile_catalog_file
+from .locales import check_locale
+from .locales import normalize_locale
+from .manifest import write_bundles_manifest
 from .utils import compile_translations
-from .utils import create_new_language_pack
 from .utils import extract_translations
 from .utils import update_translations
 
 
-def check_locales(locales: List[str]):
+def check_locales(locales: List[str]) -> List[str]:
     """
     Check if a given list  of locale values is valid.
 
@@ -30,6 +29,8 @@ def check_locales(locales: List[str]):
 
     Args:
         locales: List of locales
+    Returns:
+        The normalized locales
     Raises:
         ValueError: if the local is not valid.
     """
@@ -37,6 +38,8 @@ def check_locales(locales: List[str]):
         if not check_locale(locale):
             raise ValueError(f"Invalid locale '{locale}'".format(locale=locale))
 
+    return [normalize_locale(locale) for locale in locales]
+
 
 def normalize_project(project: str) -> str:
     """
@@ -50,7 +53,15 @@ def normalize_project(project: str) -> str:
     return project.lower().replace("-", "_")
 
 
-def extract_package(package_repo_dir, project, merge: bool = True):
+def extract_package(
+    package_repo_dir,
+    project,
+    merge: bool = True,
+    cache_dir=None,
+    jobs=None,
+    engine="node",
+    use_git=False,
+):
     """
     FIXME:
     """
@@ -63,15 +74,32 @@ def extract_package(package_repo_dir, project, merge: bool = True):
             "Output dir `{output_dir}` not found!".format(output_dir=output_dir)
         )
 
-    extract_translations(package_repo_dir, output_dir, project, merge)
-
-
-def update_package(package_repo_dir, project, locales):
+    extract_translations(
+        package_repo_dir,
+        output_dir,
+        project,
+        merge,
+        cache_dir,
+        jobs,
+        engine,
+        use_git=use_git,
+    )
+
+
+def update_package(
+    package_repo_dir,
+    project,
+    locales,
+    cache_dir=None,
+    jobs=None,
+    engine="node",
+    use_git=False,
+):
     """
     FIXME:
     """
     if locales:
-        check_locales(locales)
+        locales = check_locales(locales)
 
     project = normalize_project(project)
     output_dir = package_repo_dir / project
@@ -81,27 +109,53 @@ def update_package(package_repo_dir, project, locales):
             "Output dir `{output_dir}` not found!".format(output_dir=output_dir)
         )
 
-    update_translations(package_repo_dir, output_dir, project, locales)
-
-
-def compile_package(package_repo_dir, project, locales):
+    update_translations(
+        package_repo_dir,
+        output_dir,
+        project,
+        locales,
+        cache_dir,
+        jobs,
+        engine,
+        use_git=use_git,
+    )
+
+
+def compile_package(
+    package_repo_dir,
+    project,
+    locales,
+    jobs=None,
+    incremental=False,
+    json_format="pretty",
+):
     """
     FIXME
     """
     if locales:
-        check_locales(locales)
+        locales = check_locales(locales)
 
     project = normalize_project(project)
     output_dir = package_repo_dir / project
-    po_paths = compile_translations(output_dir, project, locales)
-    for _, po_path in po_paths.items():
-        output_path = po_path.parent
-        convert_catalog_to_json(po_path, output_path, project)
-        compile_to_mo(po_path)
+    compile_translations(
+        output_dir,
+        project,
+        locales,
+        jobs,
+        incremental=incremental,
+        json_format=json_format,
+    )
 
 
 def extract_language_pack(
-    package_repo_dir, language_packs_repo_dir, project, merge: bool = True
+    package_repo_dir,
+    language_packs_repo_dir,
+    project,
+    merge: bool = True,
+    cache_dir=None,
+    jobs=None,
+    engine="node",
+    use_git=False,
 ) -> None:
     """
     Args:
@@ -109,6 +163,11 @@ def extract_language_pack(
         language_packs_repo_dir: Directory for POT files
         project: project name
         merge: Merge with existing POT file
+        cache_dir: Folder of the extraction cache; if None, the cache is disabled
+        jobs: Number of parallel extraction jobs; default to the number of CPUs
+        engine: TS(X) strings extractor; ``node`` or ``python``
+        use_git: List the Python files known to git if the package folder is
+            a git checkout
     """
     project = normalize_project(project)
 
@@ -118,15 +177,33 @@ def extract_language_pack(
         output_dir = os.path.join(language_packs_repo_dir, EXTENSIONS_FOLDER, project)
         os.makedirs(output_dir, exist_ok=True)
 
-    extract_translations(package_repo_dir, output_dir, project, merge)
-
-
-def update_language_pack(package_repo_dir, language_packs_repo_dir, project, locales):
+    extract_translations(
+        package_repo_dir,
+        output_dir,
+        project,
+        merge,
+        cache_dir,
+        jobs,
+        engine,
+        use_git=use_git,
+    )
+
+
+def update_language_pack(
+    package_repo_dir,
+    language_packs_repo_dir,
+    project,
+    locales,
+    cache_dir=None,
+    jobs=None,
+    engine="node",
+    use_git=False,
+):
     """
     FIXME
     """
     if locales:
-        check_locales(locales)
+        locales = check_locales(locales)
 
     project = normalize_project(project)
 
@@ -138,26 +215,31 @@ def update_language_pack(package_repo_dir, language_packs_repo_dir, project, loc
         )
         os.makedirs(output_dir, exist_ok=True)
 
-    update_translations(package_repo_dir, output_dir, project, locales)
+    update_translations(
+        package_repo_dir,
+        output_dir,
+        project,
+        locales,
+        cache_dir,
+        jobs,
+        engine,
+        use_git=use_git,
+    )
 
 
-def compile_po_file(po_path: Path) -> None:
+def compile_po_file(po_path: Path, json_format: str = "pretty") -> None:
     """Compile .PO files to .MO and .JSON files inplace."""
-    output_path = po_path.parent
-
-    target_json = po_path.with_suffix(".json")
-    if target_json.exists():
-        target_json.unlink()
-    convert_catalog_to_json(po_path, output_path, po_path.stem)
-
-    target_mo = po_path.with_suffix(".mo")
-    if target_mo.exists():
-        target_mo.unlink()
-    compile_to_mo(po_path)
+    compile_catalog_file(po_path, po_path.stem, merge=False, json_format=json_format)
+    write_bundles_manifest(po_path.parent.parent)
 
 
 def compile_language_pack(
-    language_packs_repo_dir: Union[Path, str], project: str, locales: List[str]
+    language_packs_repo_dir: Union[Path, str],
+    project: str,
+    locales: List[str],
+    jobs: Optional[int] = None,
+    incremental: bool = False,
+    json_format: str = "pretty",
 ) -> None:
     """
     FIXME:
@@ -165,7 +247,7 @@ def compile_language_pack(
     language_packs_repo_dir = Path(language_packs_repo_dir)
 
     if locales:
-        check_locales(locales)
+        locales = check_locales(locales)
 
     project = normalize_project(project)
 
@@ -174,36 +256,12 @@ def compile_language_pack(
     else:
         output_dir = language_packs_repo_dir / EXTENSIONS_FOLDER / project
 
-    po_paths = compile_translations(output_dir, project, locales)
-    for locale, po_path in po_paths.items():
-        output_path = po_path.parent
-        json_path = convert_catalog_to_json(po_path, output_path, project)
-        mo_path = compile_to_mo(po_path)
-
-        # Move to language pack folder
-        language_packs_dir = language_packs_repo_dir / LANG_PACKS_FOLDER
-        pkg_name = f"jupyterlab-language-pack-{locale}".replace("_", "-")
-        locale_language_pack_dir = (
-            language_packs_dir / pkg_name / pkg_name.replace("-", "_")
-        )
-
-        # Check if it exists, otherwise create it
-        if not locale_language_pack_dir.is_dir():
-            create_new_language_pack(language_packs_dir, locale)
-
-        output_dir = (
-            locale_language_pack_dir
-            / LOCALE_FOLDER
-            / locale.replace("-", "_")
-            / LC_MESSAGES
-        )
-
-        target_mo = output_dir / mo_path.name
-        if target_mo.exists():
-            target_mo.unlink()
-        mo_path.rename(target_mo)
-
-        target_json = output_dir / json_path.name
-        if target_json.exists():
-            target_json.unlink()
-        json_path.rename(target_json)
+    compile_translations(
+        output_dir,
+        project,
+        locales,
+        jobs,
+        language_packs_dir=language_packs_repo_dir / LANG_PACKS_FOLDER,
+        incremental=incremental,
+        json_format=json_format,
+    )
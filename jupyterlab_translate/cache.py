@@ -0,0 +1,276 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+"""
+Persistent cache of extracted translatable strings.
+"""
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import IO
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+# Bump when the layout of the cache file or of its entries changes
+CACHE_VERSION = 2
+
+
+def default_cache_dir() -> Path:
+    """Get the default folder to store extraction caches in."""
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if cache_home:
+        return Path(cache_home) / "jupyterlab-translate"
+    return Path.home() / ".cache" / "jupyterlab-translate"
+
+
+def hash_file(path: Union[str, Path]) -> str:
+    """
+    Compute the content hash of a file.
+
+    Args:
+        path: File path
+    Returns:
+        Hexadecimal SHA-256 digest of the file content
+    """
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "wb", **kwargs) -> Iterator[IO]:
+    """
+    Open a file to write it atomically.
+
+    The content is written to a temporary file in the same folder that then
+    replaces the file on success; readers see either the old or the new
+    content.
+
+    Args:
+        path: File path
+        mode: Writing mode; ``wb`` or ``w``
+        kwargs: Other arguments of ``open``
+    Returns:
+        Context manager yielding the temporary file
+    """
+    # Unlike `tempfile`, keep the default permissions of new files
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def replace_file(path: Path, content: bytes) -> None:
+    """
+    Write a file atomically.
+
+    Args:
+        path: File path
+        content: File content
+    """
+    with atomic_open(path) as f:
+        f.write(content)
+
+
+def _dump_entry(entry: Dict) -> Dict:
+    return dict(entry, occurrences=[list(o) for o in entry.get("occurrences", [])])
+
+
+def _load_entry(entry: Dict) -> Dict:
+    entry = dict(entry, occurrences=[tuple(o) for o in entry.get("occurrences", [])])
+    if "msgstr_plural" in entry:
+        # JSON turns the plural indexes into strings
+        entry["msgstr_plural"] = {int(k): v for k, v in entry["msgstr_plural"].items()}
+    return entry
+
+
+class RelativePaths:
+    """
+    Memoized mapping of file paths to POSIX paths relative to a root folder.
+
+    Resolving a path hits the filesystem for each of its parts; the same
+    files are looked up many times during an extraction so each distinct
+    path is resolved only once.
+
+    Args:
+        root_dir: Folder the paths are relative to
+    """
+
+    def __init__(self, root_dir: Union[str, Path]):
+        self.root_dir = Path(root_dir).resolve()
+        self._paths = {}
+
+    def __call__(self, path: Union[str, Path]) -> str:
+        """
+        Get the path relative to the root folder.
+
+        Args:
+            path: File path; relative paths are relative to the current folder
+        Returns:
+            POSIX path relative to the root folder
+        Raises:
+            ValueError: if the path is not within the root folder
+        """
+        path = os.path.abspath(path)
+        relative = self._paths.get(path)
+        if relative is None:
+            relative = Path(path).resolve().relative_to(self.root_dir).as_posix()
+            self._paths[path] = relative
+        return relative
+
+
+class ExtractionCache:
+    """
+    On-disk cache of the entries extracted from the files of a repository.
+
+    Entries are stored per extractor kind and per file path relative to the
+    repository root. They are reused as long as the file content hash is
+    unchanged. The whole cache is discarded if the extractor configuration
+    changes.
+
+    Args:
+        cache_dir: Folder containing the cache files
+        repo_root_dir: Repository the strings are extracted from
+        config_key: Fingerprint of the extractors configuration
+        paths: Relative paths of the repository files to share with the
+            extractors; default to a new mapping
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        repo_root_dir: Union[str, Path],
+        config_key: str,
+        paths: Optional[RelativePaths] = None,
+    ):
+        self.repo_root_dir = Path(repo_root_dir).resolve()
+        name = hashlib.sha256(str(self.repo_root_dir).encode("utf-8")).hexdigest()
+        self.path = Path(cache_dir) / f"{name[:16]}.json"
+        self.config_key = config_key
+        self.paths = RelativePaths(self.repo_root_dir) if paths is None else paths
+        self._files = {}
+        self._dirty = False
+        self.load()
+
+    def _key(self, path: Union[str, Path]) -> str:
+        return self.paths(path)
+
+    def load(self) -> None:
+        """Load the cache file if it matches the current configuration."""
+        self._files = {}
+        if not self.path.is_file():
+            return
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except ValueError:
+            return
+
+        if (
+            data.get("version") == CACHE_VERSION
+            and data.get("config") == self.config_key
+        ):
+            self._files = data.get("files", {})
+
+    def get_value(self, kind: str, path: Union[str, Path], digest: str) -> Any:
+        """
+        Get the cached value of a file.
+
+        Args:
+            kind: Value kind
+            path: File path
+            digest: Current content hash or stamp of the file
+        Returns:
+            The cached value or None if the file is unknown or changed
+        """
+        cached = self._files.get(kind, {}).get(self._key(path))
+        if cached is None or cached["hash"] != digest:
+            return None
+        return cached["entries"]
+
+    def set_value(
+        self, kind: str, path: Union[str, Path], digest: str, value: Any
+    ) -> None:
+        """
+        Store a JSON serializable value computed from a file.
+
+        Args:
+            kind: Value kind
+            path: File path
+            digest: Content hash or stamp of the file
+            value: Value to store
+        """
+        self._files.setdefault(kind, {})[self._key(path)] = {
+            "hash": digest,
+            "entries": value,
+        }
+        self._dirty = True
+
+    def get(
+        self, kind: str, path: Union[str, Path], digest: str
+    ) -> Optional[List[Dict]]:
+        """
+        Get the cached entries of a file.
+
+        Args:
+            kind: Extractor kind
+            path: File path
+            digest: Current content hash of the file
+        Returns:
+            The cached entries or None if the file is unknown or changed
+        """
+        entries = self.get_value(kind, path, digest)
+        if entries is None:
+            return None
+        return [_load_entry(e) for e in entries]
+
+    def set(
+        self, kind: str, path: Union[str, Path], digest: str, entries: List[Dict]
+    ) -> None:
+        """
+        Store the entries extracted from a file.
+
+        Args:
+            kind: Extractor kind
+            path: File path
+            digest: Content hash of the file
+            entries: Extracted entries
+        """
+        self.set_value(kind, path, digest, [_dump_entry(e) for e in entries])
+
+    def prune(self, kind: str, paths: Iterable[Union[str, Path]]) -> None:
+        """
+        Remove the files of a kind that are not in ``paths``.
+
+        Args:
+            kind: Extractor or value kind
+            paths: Files to keep
+        """
+        files = self._files.get(kind, {})
+        keep = set(map(self._key, paths))
+        for key in set(files) - keep:
+            del files[key]
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache file if it was modified."""
+        if not self._dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": CACHE_VERSION,
+            "config": self.config_key,
+            "files": self._files,
+        }
+        replace_file(self.path, json.dumps(data).encode("utf-8"))
+        self._dirty = False
@@ -15,6 +15,9 @@ from .api import extract_language_pack
 from .api import extract_package
 from .api import update_language_pack
 from .api import update_package
+from .cache import default_cache_dir
+from .constants import JSON_FORMATS
+from .constants import TSX_ENGINES
 from .contributors import CONTRIBUTORS
 from .contributors import get_contributors_report
 
@@ -34,6 +37,49 @@ project_arg = click.argument("project")
 locales_opt = click.option(
     "--locales", "-l", default=None, multiple=True, help="Locale languages to use"
 )
+cache_dir_opt = click.option(
+    "--cache-dir",
+    default=default_cache_dir,
+    type=click.Path(path_type=Path),
+    show_default="~/.cache/jupyterlab-translate",
+    help="Folder of the extraction cache",
+)
+no_cache_opt = click.option(
+    "--no-cache", is_flag=True, default=False, help="Disable the extraction cache"
+)
+jobs_opt = click.option(
+    "--jobs",
+    "-j",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of parallel jobs  [default: number of CPUs]",
+)
+incremental_opt = click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Skip the catalogs unchanged since the last incremental compilation",
+)
+json_format_opt = click.option(
+    "--json-format",
+    default="pretty",
+    type=click.Choice(JSON_FORMATS),
+    show_default=True,
+    help="Layout of the JSON bundles; `compact` strips the whitespace",
+)
+engine_opt = click.option(
+    "--engine",
+    default="node",
+    type=click.Choice(TSX_ENGINES),
+    show_default=True,
+    help="TS(X) strings extractor; `python` does not require Node.js",
+)
+use_git_opt = click.option(
+    "--use-git",
+    is_flag=True,
+    default=False,
+    help="List the Python files known to git if the package is a git checkout",
+)
 
 
 @click.group(
@@ -55,9 +101,21 @@ def main():
 )
 @package_repo_dir_arg
 @project_arg
-def extract(package_repo_dir, project):
+@cache_dir_opt
+@no_cache_opt
+@jobs_opt
+@engine_opt
+@use_git_opt
+def extract(package_repo_dir, project, cache_dir, no_cache, jobs, engine, use_git):
     click.echo("Updating for stand alone package")
-    extract_package(package_repo_dir, project)
+    extract_package(
+        package_repo_dir,
+        project,
+        cache_dir=None if no_cache else cache_dir,
+        jobs=jobs,
+        engine=engine,
+        use_git=use_git,
+    )
 
 
 @main.command(
@@ -66,9 +124,24 @@ def extract(package_repo_dir, project):
 @package_repo_dir_arg
 @project_arg
 @locales_opt
-def update(package_repo_dir, project, locales):
+@cache_dir_opt
+@no_cache_opt
+@jobs_opt
+@engine_opt
+@use_git_opt
+def update(
+    package_repo_dir, project, locales, cache_dir, no_cache, jobs, engine, use_git
+):
     click.echo("Updating for stand alone package")
-    update_package(package_repo_dir, project, locales)
+    update_package(
+        package_repo_dir,
+        project,
+        locales,
+        cache_dir=None if no_cache else cache_dir,
+        jobs=jobs,
+        engine=engine,
+        use_git=use_git,
+    )
 
 
 @main.command(
@@ -106,9 +179,19 @@ def update_contributors(package_repo_dir):
 @package_repo_dir_arg
 @project_arg
 @locales_opt
-def compile(package_repo_dir, project, locales):
+@jobs_opt
+@incremental_opt
+@json_format_opt
+def compile(package_repo_dir, project, locales, jobs, incremental, json_format):
     click.echo("Compiling for stand alone package")
-    compile_package(package_repo_dir, project, locales)
+    compile_package(
+        package_repo_dir,
+        project,
+        locales,
+        jobs=jobs,
+        incremental=incremental,
+        json_format=json_format,
+    )
 
 
 # --- Localization for language packs
@@ -121,9 +204,31 @@ def compile(package_repo_dir, project, locales):
 @package_repo_dir_arg
 @lang_packs_repo_dir_arg
 @project_arg
-def extract_pack(package_repo_dir, language_packs_repo_dir, project):
+@cache_dir_opt
+@no_cache_opt
+@jobs_opt
+@engine_opt
+@use_git_opt
+def extract_pack(
+    package_repo_dir,
+    language_packs_repo_dir,
+    project,
+    cache_dir,
+    no_cache,
+    jobs,
+    engine,
+    use_git,
+):
     click.echo("Extracting for language pack")
-    extract_language_pack(package_repo_dir, language_packs_repo_dir, project)
+    extract_language_pack(
+        package_repo_dir,
+        language_packs_repo_dir,
+        project,
+        cache_dir=None if no_cache else cache_dir,
+        jobs=jobs,
+        engine=engine,
+        use_git=use_git,
+    )
 
 
 @main.command(
@@ -135,16 +240,52 @@ def extract_pack(package_repo_dir, language_packs_repo_dir, project):
 @lang_packs_repo_dir_arg
 @project_arg
 @locales_opt
-def update_pack(package_repo_dir, language_packs_repo_dir, project, locales):
+@cache_dir_opt
+@no_cache_opt
+@jobs_opt
+@engine_opt
+@use_git_opt
+def update_pack(
+    package_repo_dir,
+    language_packs_repo_dir,
+    project,
+    locales,
+    cache_dir,
+    no_cache,
+    jobs,
+    engine,
+    use_git,
+):
     click.echo("Updating for language pack")
-    update_language_pack(package_repo_dir, language_packs_repo_dir, project, locales)
+    update_language_pack(
+        package_repo_dir,
+        language_packs_repo_dir,
+        project,
+        locales,
+        cache_dir=None if no_cache else cache_dir,
+        jobs=jobs,
+        engine=engine,
+        use_git=use_git,
+    )
 
 
 @main.command(help=("Compile catalogs for a jupyterlab-language-pack."))
 @lang_packs_repo_dir_arg
 @project_arg
 @locales_opt
-def compile_pack(language_packs_repo_dir, project, locales):
+@jobs_opt
+@incremental_opt
+@json_format_opt
+def compile_pack(
+    language_packs_repo_dir, project, locales, jobs, incremental, json_format
+):
     click.echo("Compiling for Jupyterlab Language Pack")
 
-    compile_language_pack(language_packs_repo_dir, project, locales)
+    compile_language_pack(
+        language_packs_repo_dir,
+        project,
+        locales,
+        jobs=jobs,
+        incremental=incremental,
+        json_format=json_format,
+    )
@@ -57,3 +57,11 @@ GETTEXT_CONFIG = {
     "headers": {"Language": ""},
     "output": None,
 }
+
+# Engines extracting the strings of TS(X) files: the bundled gettext-extract
+# run with Node.js or the native Python extractor
+TSX_ENGINES = ("node", "python")
+
+# Layouts of the Jed json bundles: indented with sorted keys for review diffs
+# or without whitespace to reduce the size downloaded by JupyterLab
+JSON_FORMATS = ("pretty", "compact")
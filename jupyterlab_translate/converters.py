@@ -1,29 +1,51 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
 import json
+import re
 from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
 
 import polib
+from babel.messages.catalog import Message
+from babel.messages.catalog import TranslationError
+from babel.messages.checkers import python_format
 
+from .cache import atomic_open
+from .cache import replace_file
+from .constants import JSON_FORMATS
+from .manifest import BuildManifest
 
-def convert_catalog_to_json(po_path: Path, output_dir: Path, project: str) -> Path:
+NPLURALS_PATTERN = re.compile(r"nplurals\s*=\s*(\d+)")
+
+
+def read_catalog(po_path: Path) -> polib.POFile:
     """
-    Convert the `.po` format to Jed json format merging any existing json files.
+    Parse a `.po` file to compile it.
 
     Args:
         po_path: PO file path
-        output_dir: output directory
-        project: project name
 
     Returns:
-        JSON file path
+        The catalog
     """
-    json_name = po_path.with_suffix(".json").name
-    json_path = output_dir / json_name
-
     # Do not add column wrapping by using a large value!
-    po = polib.pofile(str(po_path), wrapwidth=100000)
+    return polib.pofile(str(po_path), wrapwidth=100000)
+
+
+def catalog_to_jed(po: polib.POFile, project: str) -> Dict:
+    """
+    Convert a catalog to the Jed json format.
+
+    Args:
+        po: Catalog
+        project: project name
 
+    Returns:
+        Jed json data
+    """
     # Add metadata
     result = {
         "": {
@@ -34,13 +56,6 @@ def convert_catalog_to_json(po_path: Path, output_dir: Path, project: str) -> Pa
         }
     }
 
-    # Load existing file in case some old strings need to remain
-    if json_path.is_file():
-        data = json.loads(json_path.read_text())
-
-        data.pop("")  # Remove old metadata
-        result.update(data)
-
     for entry in po:
         if entry.obsolete:
             continue
@@ -63,6 +78,220 @@ def convert_catalog_to_json(po_path: Path, output_dir: Path, project: str) -> Pa
                     # But some languages don't have plural form.
                     plural.append("")
 
-    json_path.write_text(json.dumps(result, sort_keys=True, indent=4))
+    return result
+
+
+def write_jed(
+    json_path: Path, result: Dict, merge: bool = True, json_format: str = "pretty"
+) -> None:
+    """
+    Write a Jed json bundle.
+
+    Args:
+        json_path: JSON file path
+        result: Jed json data
+        merge: Whether to keep the strings of an existing json file
+        json_format: Bundle layout; one of ``JSON_FORMATS``
+    """
+    if json_format not in JSON_FORMATS:
+        raise ValueError(f"Unknown json format '{json_format}'.")
+
+    # Load existing file in case some old strings need to remain
+    if merge and json_path.is_file():
+        data = json.loads(json_path.read_text())
+
+        data.pop("")  # Remove old metadata
+        data.update(result)
+        result = data
+
+    if json_format == "pretty":
+        options = {"indent": 4}
+    else:
+        options = {"separators": (",", ":")}
+    # `json.dump` streams the encoded chunks instead of building the string
+    with atomic_open(json_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, sort_keys=True, **options)
+
+
+def convert_catalog_to_json(
+    po_path: Path, output_dir: Path, project: str, json_format: str = "pretty"
+) -> Path:
+    """
+    Convert the `.po` format to Jed json format merging any existing json files.
+
+    Args:
+        po_path: PO file path
+        output_dir: output directory
+        project: project name
+        json_format: Bundle layout; one of ``JSON_FORMATS``
+
+    Returns:
+        JSON file path
+    """
+    json_path = output_dir / po_path.with_suffix(".json").name
+    write_jed(
+        json_path,
+        catalog_to_jed(read_catalog(po_path), project),
+        json_format=json_format,
+    )
 
     return json_path
+
+
+def check_catalog(po: polib.POFile) -> List[Tuple[polib.POEntry, str]]:
+    """
+    Validate the translations of a catalog as `pybabel compile` does.
+
+    The placeholders of python format strings must match and plural messages
+    must have as many translations as declared by the ``Plural-Forms`` header.
+
+    Args:
+        po: Catalog
+
+    Returns:
+        List of (entry, error message)
+    """
+    match = NPLURALS_PATTERN.search(po.metadata.get("Plural-Forms", ""))
+    nplurals = int(match.group(1)) if match else None
+
+    errors = []
+    for entry in po:
+        if entry.obsolete or not entry.msgid:
+            continue
+
+        if entry.msgid_plural:
+            msgstrs = [v for _, v in sorted(entry.msgstr_plural.items())]
+            if nplurals is not None and len(msgstrs) != nplurals:
+                errors.append(
+                    (entry, f"Wrong number of plural forms (expected {nplurals})")
+                )
+            # Message flags python format strings from their id
+            message = Message(
+                (entry.msgid, entry.msgid_plural), msgstrs, flags=entry.flags
+            )
+        else:
+            message = Message(entry.msgid, entry.msgstr, flags=entry.flags)
+
+        try:
+            python_format(None, message)
+        except TranslationError as e:
+            errors.append((entry, str(e)))
+
+    return errors
+
+
+def json_format_of(json_path: Path) -> Optional[str]:
+    """
+    Get the layout of a Jed json bundle written by ``write_jed``.
+
+    Args:
+        json_path: JSON file path
+
+    Returns:
+        One of ``JSON_FORMATS`` or None if the layout is unknown
+    """
+    with json_path.open("rb") as f:
+        start = f.read(2)
+    # Bundles always start with the metadata key
+    return {b"{\n": "pretty", b'{"': "compact"}.get(start)
+
+
+def write_catalog(
+    po: polib.POFile,
+    po_path: Path,
+    project: str,
+    output_dir: Optional[Path] = None,
+    merge: bool = True,
+    json_format: str = "pretty",
+) -> Tuple[Path, Path]:
+    """
+    Write the `.mo` and Jed json formats of a parsed catalog atomically.
+
+    Args:
+        po: Catalog
+        po_path: PO file path of the catalog
+        project: project name
+        output_dir: output directory; default to the PO file directory
+        merge: Whether to keep the strings of an existing json file
+        json_format: Bundle layout; one of ``JSON_FORMATS``
+
+    Returns:
+        (MO file path, JSON file path)
+    """
+    output_dir = po_path.parent if output_dir is None else output_dir
+    json_path = output_dir / po_path.with_suffix(".json").name
+    mo_path = output_dir / po_path.with_suffix(".mo").name
+
+    write_jed(json_path, catalog_to_jed(po, project), merge, json_format)
+    replace_file(mo_path, po.to_binary())
+
+    return mo_path, json_path
+
+
+def compile_catalog_file(
+    po_path: Path,
+    project: str,
+    output_dir: Optional[Path] = None,
+    check: bool = False,
+    merge: bool = True,
+    incremental: bool = False,
+    json_format: str = "pretty",
+) -> Tuple[Path, Path, bool]:
+    """
+    Compile a `.po` file into the `.mo` and Jed json formats.
+
+    The catalog is parsed once for both outputs.
+
+    Args:
+        po_path: PO file path
+        project: project name
+        output_dir: output directory; default to the PO file directory
+        check: Whether to validate the translations first
+        merge: Whether to keep the strings of an existing json file
+        incremental: Whether to skip the compilation if the outputs were
+            compiled from the same `.po` file according to their build manifest
+        json_format: Bundle layout; one of ``JSON_FORMATS``
+
+    Returns:
+        (MO file path, JSON file path, whether the outputs were written)
+
+    Raises:
+        ValueError: if ``check`` is True and some translations are invalid.
+    """
+    output_dir = po_path.parent if output_dir is None else output_dir
+    json_path = output_dir / po_path.with_suffix(".json").name
+    mo_path = output_dir / po_path.with_suffix(".mo").name
+
+    manifest = None
+    if incremental:
+        manifest = BuildManifest(
+            output_dir,
+            po_path.stem,
+            {
+                "project": project,
+                "check": check,
+                "merge": merge,
+                "json_format": json_format,
+            },
+        )
+        if manifest.is_up_to_date([po_path], [mo_path, json_path]):
+            return mo_path, json_path, False
+
+    po = read_catalog(po_path)
+
+    if check:
+        errors = check_catalog(po)
+        if errors:
+            raise ValueError(
+                "\n".join(
+                    f"error: {po_path!s}:{entry.linenum}: {error}"
+                    for entry, error in errors
+                )
+            )
+
+    write_catalog(po, po_path, project, output_dir, merge, json_format)
+
+    if manifest is not None:
+        manifest.record([po_path], [mo_path, json_path])
+
+    return mo_path, json_path, True
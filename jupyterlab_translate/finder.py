@@ -1,26 +1,347 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import hashlib
+import importlib.util
 import json
 import os
 import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
 
 # See compatibility note on `group` keyword in https://docs.python.org/3/library/importlib.metadata.html#entry-points
 if sys.version_info < (3, 10):
+    from importlib_metadata import distributions
     from importlib_metadata import entry_points
 else:
+    from importlib.metadata import distributions
     from importlib.metadata import entry_points
 
-from .utils import check_locale
+from . import __version__
+from .cache import default_cache_dir
+from .cache import hash_file
+from .cache import replace_file
+from .constants import LC_MESSAGES
+from .locales import check_locale
+from .manifest import BUNDLE_SUFFIXES
+from .manifest import BUNDLES_MANIFEST
+from .manifest import read_bundles_manifest
+from .mo import MOCatalog
 
 
 JUPYTERLAB_LANGUAGEPACK_ENTRY = "jupyterlab.languagepack"
 JUPYTERLAB_LOCALE_ENTRY = "jupyterlab.locale"
+# Number of memory-mapped catalogs kept open
+MAX_OPEN_CATALOGS = 128
+# Number of bundles hashes and manifests kept in memory
+MAX_HASHED_BUNDLES = 1024
+MAX_READ_MANIFESTS = 128
 
 
-def merge_data():
+@lru_cache(maxsize=MAX_OPEN_CATALOGS)
+def _open_catalog(path: str, mtime: int) -> MOCatalog:
+    # A catalog replaced by a new compilation has a new modification time
+    return MOCatalog(path)
+
+
+def get_catalog(mo_path: Union[str, Path]) -> MOCatalog:
+    """
+    Get a compiled catalog looking up translations in a memory map.
+
+    The catalogs are shared within the process until their file changes.
+
+    Returns
+    -------
+    MOCatalog
+        Catalog of the `.mo` file at `mo_path`.
+    """
+    path = os.path.abspath(mo_path)
+    return _open_catalog(path, os.stat(path).st_mtime_ns)
+
+
+def _installation_stamp() -> Tuple[Tuple[str, int], ...]:
+    # Installing or removing a distribution modifies its `sys.path` folder
+    stamp = []
+    for path in sys.path:
+        try:
+            stamp.append((path, os.stat(path or ".").st_mtime_ns))
+        except OSError:
+            continue
+    return tuple(stamp)
+
+
+@lru_cache(maxsize=8)
+def _entry_points(group: str, stamp: Tuple[Tuple[str, int], ...]) -> tuple:
+    return tuple(entry_points(group=group))
+
+
+def _get_entry_points(group: str) -> tuple:
+    return _entry_points(group, _installation_stamp())
+
+
+def _find_module_dir(module: str) -> Optional[str]:
+    # Only the top level package is looked up, none of them is imported
+    top_level, *parts = module.split(".")
+    try:
+        spec = importlib.util.find_spec(top_level)
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+
+    if spec.submodule_search_locations:
+        path = os.path.join(list(spec.submodule_search_locations)[0], *parts)
+        # Same as the folder of the module `__file__`
+        return path if os.path.isdir(path) else os.path.dirname(path)
+    if spec.origin and not parts:
+        return os.path.dirname(spec.origin)
+    return None
+
+
+@lru_cache(maxsize=8)
+def _locale_folders(stamp: Tuple[Tuple[str, int], ...]) -> Dict[str, str]:
+    folders = {}
+    for entry_point in _entry_points(JUPYTERLAB_LOCALE_ENTRY, stamp):
+        name = entry_point.name.replace("-", "_").lower()
+        module = entry_point.value.split(":")[0].strip()
+        package_root_path = _find_module_dir(module)
+        if package_root_path is None:
+            print(f"Unable to find the package '{module}' of '{entry_point.name}'")
+            continue
+
+        locale_path = os.path.join(package_root_path, "locale")
+        if os.path.isdir(locale_path):
+            folders[name] = locale_path
+    return folders
+
+
+def get_installed_packages_locale_folders() -> Dict[str, str]:
+    """
+    Get the locale folders of the installed jupyterlab extensions.
+
+    The folders are found from the distributions metadata without importing
+    the extensions. They are cached until the installed distributions change.
+
+    Returns
+    -------
+    dict
+        Locale folder of each package.
+        >>>{"package_name": "/path/to/package_name/locale", ...}
+    """
+    return dict(_locale_folders(_installation_stamp()))
+
+
+@lru_cache(maxsize=8)
+def _distributions_key(stamp: Tuple[Tuple[str, int], ...]) -> str:
+    installed = sorted(
+        f"{dist.metadata['Name']}=={dist.version}" for dist in distributions()
+    )
+    content = json.dumps([__version__, installed])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _find_language_pack(locale: str) -> Optional[Tuple[str, str]]:
+    # Get the module name and the locale folder of the language pack
+    for entry_point in _get_entry_points(JUPYTERLAB_LANGUAGEPACK_ENTRY):
+        if entry_point.name == locale:
+            module = entry_point.value.split(":")[0].strip()
+            package_root_path = _find_module_dir(module)
+            if package_root_path is not None:
+                return module, os.path.join(package_root_path, "locale", locale)
+    return None
+
+
+def _bundles_stamp(locale: str) -> List[Tuple[str, int, int]]:
+    # Paths, modification times and sizes of the bundles merged for `locale`
+    paths = [
+        os.path.join(locale_path, locale, LC_MESSAGES, f"{name}.json")
+        for name, locale_path in get_installed_packages_locale_folders().items()
+    ]
+    language_pack = _find_language_pack(locale)
+    if language_pack is not None:
+        messages_path = os.path.join(language_pack[1], LC_MESSAGES)
+        if os.path.isdir(messages_path):
+            paths.extend(
+                os.path.join(messages_path, file_name)
+                for file_name in sorted(os.listdir(messages_path))
+                if file_name.endswith(".json")
+            )
+
+    stamp = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        stamp.append((path, stat.st_mtime_ns, stat.st_size))
+    return stamp
+
+
+def _read_bundles(messages_path: str) -> Dict[str, dict]:
+    bundles = {}
+    if os.path.isdir(messages_path):
+        for file_name in sorted(os.listdir(messages_path)):
+            domain, ext = os.path.splitext(file_name)
+            if ext == ".json":
+                with open(os.path.join(messages_path, file_name), "r") as fh:
+                    bundles[domain] = json.load(fh)
+    return bundles
+
+
+def _merge_bundles(locale: str) -> Dict[str, dict]:
+    merged = {}
+    for name, data in get_installed_packages_locale(locale).items():
+        merged[name] = data[locale]
+
+    # The language pack translations take precedence
+    language_pack = _find_language_pack(locale)
+    if language_pack is not None:
+        messages_path = os.path.join(language_pack[1], LC_MESSAGES)
+        for domain, data in _read_bundles(messages_path).items():
+            merged[domain] = {**merged.get(domain, {}), **data}
+
+    return merged
+
+
+@lru_cache(maxsize=8)
+def _merged_data(locale: str, cache_path: Path) -> Dict[str, dict]:
+    if cache_path.is_file():
+        try:
+            return json.loads(cache_path.read_text(encoding="utf-8"))
+        except ValueError:
+            pass
+
+    merged = _merge_bundles(locale)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        replace_file(
+            cache_path, json.dumps(merged, separators=(",", ":")).encode("utf-8")
+        )
+    except OSError as e:
+        print(e)
+    else:
+        # Drop the merged bundles of previous installations
+        for previous in cache_path.parent.glob(f"{locale}-*.json"):
+            if previous != cache_path:
+                try:
+                    previous.unlink()
+                except OSError:
+                    pass
+    return merged
+
+
+def merge_data(
+    locale: str, cache_dir: Optional[Union[str, Path]] = None
+) -> Dict[str, dict]:
     """
     Merge language pack data with locale data bundled in packages.
+
+    The Jed bundles of the `locale` language pack and of the installed
+    extensions are merged per domain; the language pack translations take
+    precedence. The result is cached on disk and in memory for the installed
+    distributions names and versions and the bundles modification times and
+    sizes. It must not be modified.
+
+    Parameters
+    ----------
+    locale: str
+        Locale of the bundles.
+    cache_dir: str or Path, optional
+        Folder of the merged bundles cache; default to the extraction cache
+        folder.
+
+    Returns
+    -------
+    dict
+        Jed data of each domain.
+        >>>{"jupyterlab": {"": {"domain": "jupyterlab", ...}, ...}, ...}
+    """
+    if not check_locale(locale):
+        print("Locale '{locale}' not valid!".format(locale=locale))
+        return {}
+
+    cache_dir = Path(default_cache_dir() if cache_dir is None else cache_dir)
+    content = json.dumps(
+        [_distributions_key(_installation_stamp()), _bundles_stamp(locale)]
+    )
+    key = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return _merged_data(locale, cache_dir / "bundles" / f"{locale}-{key[:16]}.json")
+
+
+@lru_cache(maxsize=MAX_HASHED_BUNDLES)
+def _hash_bundle(path: str, mtime: int) -> Dict[str, Any]:
+    return {"sha256": hash_file(path), "size": os.stat(path).st_size}
+
+
+@lru_cache(maxsize=MAX_READ_MANIFESTS)
+def _read_manifest(locale_dir: str, mtime: int) -> Dict[str, Dict[str, Any]]:
+    return read_bundles_manifest(Path(locale_dir))
+
+
+def _locale_bundles_hashes(
+    locale_dir: str, domain: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    manifest_path = os.path.join(locale_dir, BUNDLES_MANIFEST)
+    try:
+        manifest_mtime = os.stat(manifest_path).st_mtime_ns
+    except OSError:
+        manifest, manifest_mtime = {}, -1
+    else:
+        manifest = _read_manifest(locale_dir, manifest_mtime)
+
+    hashes = {}
+    messages_path = os.path.join(locale_dir, LC_MESSAGES)
+    names = sorted(os.listdir(messages_path)) if os.path.isdir(messages_path) else []
+    for name in names:
+        stem, ext = os.path.splitext(name)
+        if ext not in BUNDLE_SUFFIXES or domain not in (None, stem):
+            continue
+        path = os.path.join(messages_path, name)
+        stat = os.stat(path)
+        info = manifest.get(f"{LC_MESSAGES}/{name}")
+        # Files modified after the manifest was written are hashed
+        if (
+            info is None
+            or info.get("size") != stat.st_size
+            or stat.st_mtime_ns > manifest_mtime
+        ):
+            info = _hash_bundle(path, stat.st_mtime_ns)
+        hashes[name] = info
+    return hashes
+
+
+def get_bundles_hashes(locale: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
     """
+    Get the content hash and size of the compiled bundles of a locale.
+
+    The hashes are read from the bundles manifest written by the compilation
+    if it is up to date; servers can use them as ETags or in immutable URLs.
+
+    Returns
+    -------
+    dict
+        Bundles of the language pack module and of the extensions.
+        >>>{"package_name": {"domain.json": {"sha256": "...", "size": 123}}, ...}
+    """
+    bundles = {}
+    for name, locale_path in get_installed_packages_locale_folders().items():
+        locale_dir = os.path.join(locale_path, locale)
+        hashes = _locale_bundles_hashes(locale_dir, name)
+        if hashes:
+            bundles[name] = hashes
+
+    language_pack = _find_language_pack(locale)
+    if language_pack is not None:
+        hashes = _locale_bundles_hashes(language_pack[1])
+        if hashes:
+            bundles[language_pack[0]] = hashes
+
+    return bundles
 
 
 def get_installed_packages_locale(locale: str) -> dict:
@@ -40,28 +361,13 @@ def get_installed_packages_locale(locale: str) -> dict:
     """
     packages_locale_data = {}
 
-    for entry_point in entry_points(group=JUPYTERLAB_LOCALE_ENTRY):
-        name = entry_point.name.replace("-", "_").lower()
-        locales = []
-        try:
-            package_root_path = os.path.dirname(entry_point.load().__file__)
-            locale_path = os.path.join(package_root_path, "locale")
-            locales = [loc for loc in os.listdir(locales) if os.path.isdir(loc)]
-        except Exception as e:
-            print(e)
-            continue
-
-        data = {}
-        if locale in locales:
-            locale_json_path = os.path.join(
-                locale_path, locale, "LC_MESSAGES", "{name}.json".format(name=name)
-            )
-            if os.path.isfile(locale_json_path):
-                with open(locale_json_path, "r") as fh:
-                    data[locale] = json.loads(fh)
-
-        if data:
-            packages_locale_data[name] = data
+    for name, locale_path in get_installed_packages_locale_folders().items():
+        locale_json_path = os.path.join(
+            locale_path, locale, LC_MESSAGES, "{name}.json".format(name=name)
+        )
+        if os.path.isfile(locale_json_path):
+            with open(locale_json_path, "r") as fh:
+                packages_locale_data[name] = {locale: json.load(fh)}
 
     return packages_locale_data
 
@@ -77,7 +383,7 @@ def get_installed_language_packs() -> list:
     """
     return [
         entry_point.name
-        for entry_point in entry_points(group=JUPYTERLAB_LANGUAGEPACK_ENTRY)
+        for entry_point in _get_entry_points(JUPYTERLAB_LANGUAGEPACK_ENTRY)
     ]
 
 
@@ -91,7 +397,7 @@ def get_language_pack(locale: str) -> dict:
         Dictionary with language pack information in Jed format.
     """
     if check_locale(locale):
-        for entry_point in entry_points(group=JUPYTERLAB_LANGUAGEPACK_ENTRY):
+        for entry_point in _get_entry_points(JUPYTERLAB_LANGUAGEPACK_ENTRY):
             if locale == entry_point.name:
                 return entry_point.load()
         else:
@@ -0,0 +1,179 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+"""
+Indexed fuzzy matching of message identifiers.
+
+Babel compares every new message with every previous message using
+``difflib``. Here the previous messages are indexed by character trigrams;
+only the candidates sharing the most trigrams with a new message are scored
+with the same ``difflib`` ratio as Babel.
+"""
+import heapq
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from babel.messages.catalog import Catalog
+from babel.messages.catalog import Message
+
+# Default minimal similarity ratio of a fuzzy match, as Babel
+FUZZY_CUTOFF = 0.6
+# Number of best indexed candidates scored for each message
+MAX_CANDIDATES = 32
+# Trigrams found in more than this share of the candidates are not counted
+COMMON_GRAM_RATIO = 0.5
+# ... unless there are fewer candidates than this
+MIN_COMMON_GRAM_COUNT = 1000
+
+
+def _grams(text: str) -> Set[str]:
+    if len(text) < 3:
+        return {text}
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Trigram index of strings to find their closest match.
+
+    Args:
+        strings: Indexed strings
+        cutoff: Minimal ``difflib`` similarity ratio of a match
+        max_candidates: Number of indexed candidates scored per lookup
+    """
+
+    def __init__(
+        self,
+        strings: Iterable[str],
+        cutoff: float = FUZZY_CUTOFF,
+        max_candidates: int = MAX_CANDIDATES,
+    ):
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError(f"cutoff must be in [0.0, 1.0]: {cutoff!r}")
+
+        self.cutoff = cutoff
+        self.max_candidates = max_candidates
+        self._strings: List[str] = list(dict.fromkeys(strings))
+        self._sizes: List[int] = []
+        self._postings: Dict[str, List[int]] = {}
+        for index, string in enumerate(self._strings):
+            grams = _grams(string)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(index)
+        self._max_postings = max(
+            MIN_COMMON_GRAM_COUNT, int(len(self._strings) * COMMON_GRAM_RATIO)
+        )
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def _candidates(self, word: str) -> List[int]:
+        grams = _grams(word)
+        postings = [self._postings.get(gram, []) for gram in grams]
+        rare = [p for p in postings if len(p) <= self._max_postings]
+        counts = Counter()
+        for posting in rare or postings:
+            counts.update(posting)
+
+        # A ratio is at most 2 * min(len) / sum(len); skip hopeless lengths
+        size = len(word)
+        scores = []
+        for index, shared in counts.items():
+            other = len(self._strings[index])
+            if 2.0 * min(size, other) >= self.cutoff * (size + other):
+                # Dice coefficient of the trigrams sets
+                scores.append((shared / (len(grams) + self._sizes[index]), index))
+        return [index for _, index in heapq.nlargest(self.max_candidates, scores)]
+
+    def match(self, word: str) -> Optional[str]:
+        """
+        Find the closest indexed string.
+
+        Args:
+            word: String to match
+        Returns:
+            The indexed string with the highest similarity ratio, at least
+            equal to the cutoff, or None
+        """
+        best: Optional[Tuple[float, str]] = None
+        bound = self.cutoff
+        # Same matcher as `difflib.get_close_matches`, used by Babel
+        matcher = SequenceMatcher()
+        matcher.set_seq2(word)
+        for index in self._candidates(word):
+            string = self._strings[index]
+            matcher.set_seq1(string)
+            # The quick ratios are upper bounds; skip those below the best
+            if matcher.real_quick_ratio() >= bound and matcher.quick_ratio() >= bound:
+                score = (matcher.ratio(), string)
+                if score[0] >= bound and (best is None or score > best):
+                    best = score
+                    bound = score[0]
+        return None if best is None else best[1]
+
+
+def _fuzzy_key(msgid: str) -> str:
+    # Babel matches the lower cased singular without context
+    return msgid.lower().strip()
+
+
+def add_fuzzy_matches(
+    catalog: Catalog, template: Catalog, cutoff: float = FUZZY_CUTOFF
+) -> Set:
+    """
+    Prepare a catalog to be updated from a template without Babel fuzzy matching.
+
+    Each template message missing from the catalog is matched against the
+    translated messages of the catalog. The translation of the closest one is
+    added to the catalog under the template message key and flagged as fuzzy.
+    ``Catalog.update(template, no_fuzzy_matching=True)`` then merges them as
+    Babel does for its own fuzzy matches.
+
+    Args:
+        catalog: Catalog to update
+        template: Template catalog
+        cutoff: Minimal similarity ratio of a fuzzy match
+    Returns:
+        Keys of the matched catalog messages; they must not be made obsolete
+    """
+    candidates = {}
+    for message in catalog:
+        if message.id and message.string:
+            singular = message.id[0] if message.pluralizable else message.id
+            candidates[_fuzzy_key(singular)] = message
+
+    index = None
+    matched = set()
+    for message in template:
+        if not message.id or catalog.get(message.id, message.context) is not None:
+            continue
+
+        if index is None:
+            index = FuzzyIndex(candidates, cutoff)
+        singular = message.id[0] if message.pluralizable else message.id
+        match = index.match(_fuzzy_key(singular))
+        if match is None:
+            continue
+
+        old = candidates[match]
+        old_singular = old.id[0] if old.pluralizable else old.id
+        matched.add(
+            old_singular if old.context is None else (old_singular, old.context)
+        )
+        alias = Message(
+            singular,
+            old.string,
+            user_comments=old.user_comments,
+            context=message.context,
+        )
+        # Message may drop the python-format flag according to its new id
+        alias.flags = old.flags | {"fuzzy"}
+        catalog[singular] = alias
+
+    return matched
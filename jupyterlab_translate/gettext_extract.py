@@ -1,12 +1,117 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import atexit
+import json
+import queue
 import subprocess
 import sys
 from pathlib import Path
+from typing import Union
 
 # Constants
 HERE = Path(__file__).parent.resolve()
 INDEX_JS = HERE / "index.js"
+WORKER_JS = HERE / "gettext_worker.js"
+
+
+class GettextExtractWorker:
+    """
+    Long-lived Node process running gettext-extract.
+
+    The bundled gettext-extract is loaded once by the worker. Extraction
+    requests and their results are exchanged as JSON lines on the process
+    stdin and stdout.
+    """
+
+    def __init__(self):
+        self._process = subprocess.Popen(
+            ["node", str(WORKER_JS)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            encoding="utf-8",
+        )
+        self._requests = 0
+
+    @property
+    def alive(self) -> bool:
+        """Whether the worker process is running."""
+        return self._process.poll() is None
+
+    def extract(self, cwd: Union[str, Path], config: dict) -> str:
+        """
+        Extract strings with gettext-extract.
+
+        Args:
+            cwd: Folder to run the extraction from
+            config: gettext-extract configuration; the output is ignored
+        Returns:
+            Content of the extracted POT file
+        """
+        self._requests += 1
+        request = {
+            "id": self._requests,
+            "cwd": str(Path(cwd).resolve()),
+            "config": config,
+        }
+        self._process.stdin.write(json.dumps(request) + "\n")
+        self._process.stdin.flush()
+
+        line = self._process.stdout.readline()
+        if not line:
+            raise RuntimeError("gettext-extract worker exited unexpectedly.")
+
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["pot"]
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        if self.alive:
+            self._process.stdin.close()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process.stdout.close()
+
+
+_idle_workers = queue.SimpleQueue()
+
+
+def extract(cwd: Union[str, Path], config: dict) -> str:
+    """
+    Extract strings with gettext-extract using a persistent worker.
+
+    Workers are started on demand and reused by the following calls; so
+    concurrent calls each get their own worker.
+
+    Args:
+        cwd: Folder to run the extraction from
+        config: gettext-extract configuration; the output is ignored
+    Returns:
+        Content of the extracted POT file
+    """
+    try:
+        worker = _idle_workers.get_nowait()
+    except queue.Empty:
+        worker = GettextExtractWorker()
+
+    try:
+        return worker.extract(cwd, config)
+    finally:
+        if worker.alive:
+            _idle_workers.put(worker)
+
+
+@atexit.register
+def shutdown_workers() -> None:
+    """Stop the idle workers."""
+    while True:
+        try:
+            _idle_workers.get_nowait().close()
+        except queue.Empty:
+            break
 
 
 def main():
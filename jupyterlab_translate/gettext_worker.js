@@ -0,0 +1,80 @@
+// Copyright (c) Jupyter Development Team.
+// Distributed under the terms of the Modified BSD License.
+
+/**
+ * Long-lived gettext-extract worker.
+ *
+ * The bundled gettext-extract CLI (index.js) is compiled once and then run
+ * for every request received on stdin. Each request is a JSON line
+ *
+ *   {"id": 1, "cwd": "/path/to/repo", "config": {...gettext-extract config}}
+ *
+ * and gets a JSON line response on stdout
+ *
+ *   {"id": 1, "pot": "...extracted POT content..."} or {"id": 1, "error": "..."}
+ */
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const readline = require('readline');
+const vm = require('vm');
+
+const BUNDLE = path.join(__dirname, 'index.js');
+
+// Compile the bundle once; the shebang is not valid within a function body
+const source = fs.readFileSync(BUNDLE, 'utf8').replace(/^#!.*/, '');
+const bundle = vm.compileFunction(
+  source,
+  ['exports', 'require', 'module', '__filename', '__dirname'],
+  { filename: BUNDLE }
+);
+
+const respond = message => process.stdout.write(JSON.stringify(message) + '\n');
+
+function extract(request) {
+  const tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'gettext-extract-'));
+  const configPath = path.join(tmpDir, 'config.json');
+  const outputPath = path.join(tmpDir, 'output.pot');
+  const config = Object.assign({}, request.config, { output: outputPath });
+  fs.writeFileSync(configPath, JSON.stringify(config));
+
+  const { argv, exit } = process;
+  const log = console.log;
+  const cwd = process.cwd();
+  try {
+    process.chdir(request.cwd);
+    process.argv = [argv[0], BUNDLE, '--config', configPath];
+    // Keep stdout for the protocol and do not let the CLI exit the worker
+    console.log = (...args) => console.error(...args);
+    process.exit = code => {
+      throw new Error(`gettext-extract exited with code ${code}`);
+    };
+
+    const module = { exports: {} };
+    bundle(module.exports, require, module, BUNDLE, __dirname);
+
+    return fs.readFileSync(outputPath, 'utf8');
+  } finally {
+    process.argv = argv;
+    process.exit = exit;
+    console.log = log;
+    process.chdir(cwd);
+    delete require.cache[configPath];
+    fs.rmSync(tmpDir, { recursive: true, force: true });
+  }
+}
+
+readline
+  .createInterface({ input: process.stdin, terminal: false })
+  .on('line', line => {
+    if (!line.trim()) {
+      return;
+    }
+    let request = { id: null };
+    try {
+      request = JSON.parse(line);
+      respond({ id: request.id, pot: extract(request) });
+    } catch (error) {
+      respond({ id: request.id, error: String((error && error.stack) || error) });
+    }
+  });
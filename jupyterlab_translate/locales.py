@@ -0,0 +1,48 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+"""
+Registry of the valid locale identifiers.
+"""
+from functools import lru_cache
+from typing import FrozenSet
+
+from babel import Locale
+from babel.localedata import locale_identifiers
+
+# Locales accepted although Babel has no data for them
+LOCALE_EXCEPTIONS = frozenset({"ach_UG", "no_NO"})
+
+
+def normalize_locale(locale: str) -> str:
+    """
+    Normalize a locale identifier; ``es-ES`` becomes ``es_ES``.
+
+    Args:
+        locale: Locale identifier
+    Returns:
+        The identifier with underscore separators
+    """
+    return locale.replace("-", "_")
+
+
+@lru_cache(maxsize=None)
+def known_locales() -> FrozenSet[str]:
+    """Get the identifiers of the locales with Babel data and the exceptions."""
+    return frozenset(locale_identifiers()) | LOCALE_EXCEPTIONS
+
+
+@lru_cache(maxsize=None)
+def _parse_locale(locale: str) -> bool:
+    # Babel also resolves aliases and likely subtags, e.g. zh_CN
+    try:
+        Locale.parse(locale)
+    except Exception as e:
+        print(str(e))
+        return False
+    return True
+
+
+def check_locale(locale: str) -> bool:
+    """Check if a locale is a valid value."""
+    locale = normalize_locale(locale)
+    return locale in known_locales() or _parse_locale(locale)
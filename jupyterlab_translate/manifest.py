@@ -0,0 +1,157 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+"""
+Build manifests of compiled catalogs.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from . import __version__
+from .cache import default_cache_dir
+from .cache import hash_file
+from .cache import replace_file
+from .constants import LC_MESSAGES
+
+# Bump when the layout of the manifest files changes
+MANIFEST_VERSION = 1
+# Manifest of the bundles of a locale, next to its `LC_MESSAGES` folder
+BUNDLES_MANIFEST = "bundles-manifest.json"
+BUNDLE_SUFFIXES = (".json", ".mo")
+
+
+def _hash_files(paths: List[Path]) -> Dict[str, str]:
+    return {path.name: hash_file(path) for path in paths}
+
+
+class BuildManifest:
+    """
+    Record of the inputs and outputs of a catalog compilation.
+
+    The manifest holds the content hashes of the input and output files, the
+    tool version and the compilation options. The outputs are up to date if
+    all of them still match. It is stored in the cache folder, keyed by the
+    outputs folder, so that the build state is not packaged with the outputs.
+
+    Args:
+        output_dir: Folder of the compiled files
+        domain: Catalog domain
+        options: JSON serializable compilation options
+        cache_dir: Folder of the manifests; default to the cache folder
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        domain: str,
+        options: Dict[str, Any],
+        cache_dir: Optional[Path] = None,
+    ):
+        cache_dir = Path(default_cache_dir() if cache_dir is None else cache_dir)
+        key = hashlib.sha256(str(Path(output_dir).resolve()).encode("utf-8"))
+        self.path = cache_dir / "manifests" / f"{key.hexdigest()[:16]}-{domain}.json"
+        self.options = options
+
+    def _header(self) -> Dict[str, Any]:
+        return {
+            "version": MANIFEST_VERSION,
+            "tool": __version__,
+            "options": self.options,
+        }
+
+    def is_up_to_date(self, inputs: List[Path], outputs: List[Path]) -> bool:
+        """
+        Check if the outputs were compiled from the current inputs.
+
+        Args:
+            inputs: Input files
+            outputs: Output files
+        Returns:
+            Whether the manifest matches the current files
+        """
+        if not self.path.is_file() or not all(p.is_file() for p in outputs):
+            return False
+
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except ValueError:
+            return False
+
+        return (
+            {k: data.get(k) for k in ("version", "tool", "options")} == self._header()
+            and data.get("inputs") == _hash_files(inputs)
+            and data.get("outputs") == _hash_files(outputs)
+        )
+
+    def record(self, inputs: List[Path], outputs: List[Path]) -> None:
+        """
+        Store the hashes of the compiled files.
+
+        Args:
+            inputs: Input files
+            outputs: Output files
+        """
+        data = self._header()
+        data["inputs"] = _hash_files(inputs)
+        data["outputs"] = _hash_files(outputs)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        replace_file(self.path, json.dumps(data, indent=2).encode("utf-8"))
+
+
+def _bundle_info(path: Path) -> Dict[str, Any]:
+    return {"sha256": hash_file(path), "size": path.stat().st_size}
+
+
+def write_bundles_manifest(locale_dir: Path) -> Path:
+    """
+    Write the manifest of the compiled bundles of a locale.
+
+    The manifest lists the content hash and size of each `.json` and `.mo`
+    file of the `LC_MESSAGES` folder. Servers can use the hashes as ETags or
+    to build immutable URLs.
+
+    Args:
+        locale_dir: Locale folder, containing the `LC_MESSAGES` folder
+    Returns:
+        The manifest path
+    """
+    locale_dir = Path(locale_dir)
+    files = {}
+    for path in sorted((locale_dir / LC_MESSAGES).glob("*")):
+        if path.suffix in BUNDLE_SUFFIXES and path.is_file():
+            files[path.relative_to(locale_dir).as_posix()] = _bundle_info(path)
+
+    manifest_path = locale_dir / BUNDLES_MANIFEST
+    content = json.dumps(
+        {"version": MANIFEST_VERSION, "files": files}, indent=2, sort_keys=True
+    ).encode("utf-8")
+    if not manifest_path.is_file() or manifest_path.read_bytes() != content:
+        replace_file(manifest_path, content)
+    else:
+        # Bundles rewritten with the same content must not look newer
+        os.utime(manifest_path)
+    return manifest_path
+
+
+def read_bundles_manifest(locale_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Read the manifest of the compiled bundles of a locale.
+
+    Args:
+        locale_dir: Locale folder, containing the `LC_MESSAGES` folder
+    Returns:
+        Mapping (file path relative to the locale folder, bundle information)
+        or an empty mapping if the manifest is missing or invalid
+    """
+    try:
+        data = json.loads((Path(locale_dir) / BUNDLES_MANIFEST).read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
@@ -0,0 +1,243 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+"""
+Memory-mapped lookups in compiled `.mo` catalogs.
+"""
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Union
+
+MO_MAGIC = 0x950412DE
+# Separator of the context and the message id in the catalog keys
+CONTEXT_SEPARATOR = "\x04"
+
+
+def hashpjw(key: bytes) -> int:
+    """
+    Hash a catalog key with the GNU gettext function.
+
+    Args:
+        key: Encoded key
+    Returns:
+        Unsigned 32-bit hash
+    """
+    value = 0
+    for char in key:
+        value = ((value << 4) + char) & 0xFFFFFFFF
+        high = value & 0xF0000000
+        if high:
+            value ^= high >> 24
+            value ^= high
+    return value
+
+
+def catalog_key(msgid: str, msgctxt: Optional[str] = None) -> str:
+    """
+    Get the key of a message; the Jed json bundles use the same keys.
+
+    Args:
+        msgid: Message id
+        msgctxt: Message context
+    Returns:
+        The message key
+    """
+    return msgid if not msgctxt else f"{msgctxt}{CONTEXT_SEPARATOR}{msgid}"
+
+
+class MOCatalog:
+    """
+    Read-only `.mo` catalog looking up translations in a memory map.
+
+    The strings are decoded on demand; the catalog is never loaded as a whole
+    and the mapped pages are shared by all the processes opening the file.
+    Keys are found through the hash table of the file if any. Otherwise,
+    as in the files written by polib or Babel, they are binary searched in
+    the sorted table of original strings.
+
+    Args:
+        path: `.mo` file path
+        encoding: Strings encoding
+    """
+
+    def __init__(self, path: Union[str, Path], encoding: str = "utf-8"):
+        self.path = Path(path)
+        self.encoding = encoding
+        with self.path.open("rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (magic,) = struct.unpack_from("<I", self._map)
+            self._order = "<" if magic == MO_MAGIC else ">"
+            if struct.unpack_from(f"{self._order}I", self._map)[0] != MO_MAGIC:
+                raise ValueError(f"Invalid .mo file: {self.path!s}")
+
+            (
+                _,
+                self._count,
+                self._originals,
+                self._translations,
+                self._hash_size,
+                self._hash_offset,
+            ) = struct.unpack_from(f"{self._order}6I", self._map, 4)
+        except (ValueError, struct.error):
+            self.close()
+            raise
+
+        self._metadata = None
+
+    def __enter__(self) -> "MOCatalog":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._map.close()
+
+    def _string(self, table: int, index: int) -> bytes:
+        length, offset = struct.unpack_from(
+            f"{self._order}2I", self._map, table + 8 * index
+        )
+        return self._map[offset : offset + length]
+
+    def _key(self, index: int) -> bytes:
+        # Plural originals are followed by a NUL and the plural id
+        return self._string(self._originals, index).split(b"\0", 1)[0]
+
+    def _find(self, key: bytes) -> Optional[int]:
+        if self._hash_size > 2:
+            value = hashpjw(key)
+            slot = value % self._hash_size
+            step = 1 + value % (self._hash_size - 2)
+            while True:
+                (entry,) = struct.unpack_from(
+                    f"{self._order}I", self._map, self._hash_offset + 4 * slot
+                )
+                if entry == 0:
+                    return None
+                if self._key(entry - 1) == key:
+                    return entry - 1
+                slot = (slot + step) % self._hash_size
+
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key(low) == key:
+            return low
+        return None
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """
+        Get the translations of a message.
+
+        Args:
+            key: Message key, see ``catalog_key``
+        Returns:
+            The translation, or the plural forms translations, or None if the
+            message is not translated
+        """
+        index = self._find(key.encode(self.encoding))
+        if index is None:
+            return None
+        return self._string(self._translations, index).decode(self.encoding).split("\0")
+
+    def gettext(self, msgid: str, msgctxt: Optional[str] = None) -> Optional[str]:
+        """
+        Get the translation of a message.
+
+        Args:
+            msgid: Message id
+            msgctxt: Message context
+        Returns:
+            The translation or None if the message is not translated
+        """
+        translations = self.get(catalog_key(msgid, msgctxt))
+        return None if translations is None else translations[0]
+
+    def ngettext(
+        self, msgid: str, form: int, msgctxt: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Get a plural form translation of a message.
+
+        Args:
+            msgid: Singular message id
+            form: Plural form index, computed from the ``Plural-Forms`` header
+            msgctxt: Message context
+        Returns:
+            The translation or None if the message is not translated
+        """
+        translations = self.get(catalog_key(msgid, msgctxt))
+        if translations is None or form >= len(translations):
+            return None
+        return translations[form] or None
+
+    @property
+    def metadata(self) -> Dict[str, str]:
+        """Catalog headers."""
+        if self._metadata is None:
+            header = self.get("") or [""]
+            self._metadata = {}
+            for line in header[0].splitlines():
+                name, _, value = line.partition(":")
+                if value:
+                    self._metadata[name.strip()] = value.strip()
+        return self._metadata
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over the keys of the translated messages."""
+        for index in range(self._count):
+            key = self._key(index)
+            if key:
+                yield key.decode(self.encoding)
+
+    def to_jed(self, keys: Iterable[str], domain: str) -> Dict:
+        """
+        Get Jed json data for some messages.
+
+        Args:
+            keys: Message keys, see ``catalog_key``
+            domain: Catalog domain
+        Returns:
+            Jed json data of the translated messages among ``keys``; unlike
+            the json bundles, it skips the fuzzy messages and the partially
+            translated plurals that are not compiled in `.mo` files
+        """
+        result = {
+            "": {
+                "domain": domain,
+                "version": self.metadata.get("Project-Id-Version", "").split(" ")[-1],
+                "language": self.metadata.get("Language", "").replace("_", "-"),
+                "plural_forms": self.metadata.get("Plural-Forms", ""),
+            }
+        }
+        for key in keys:
+            index = self._find(key.encode(self.encoding)) if key else None
+            if index is None:
+                continue
+
+            translations = self._string(self._translations, index)
+            translations = [
+                t for t in translations.decode(self.encoding).split("\0") if t
+            ]
+            if translations:
+                plural = b"\0" in self._string(self._originals, index)
+                if plural and len(translations) == 1:
+                    # Same as the bundles, JupyterLab expects several forms
+                    translations.append("")
+                result[key] = translations
+        return result
@@ -2,15 +2,25 @@
 # Distributed under the terms of the Modified BSD License.
 import itertools
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Any
+from typing import Optional
 
-import polib
 from hatchling.builders.hooks.plugin.interface import BuildHookInterface
 
-from jupyterlab_translate.api import compile_po_file
+from jupyterlab_translate.cache import hash_file
+from jupyterlab_translate.constants import LC_MESSAGES
 from jupyterlab_translate.contributors import CONTRIBUTORS
 from jupyterlab_translate.contributors import get_contributors_report
+from jupyterlab_translate.converters import json_format_of
+from jupyterlab_translate.converters import read_catalog
+from jupyterlab_translate.converters import write_catalog
+from jupyterlab_translate.manifest import BUNDLES_MANIFEST
+from jupyterlab_translate.manifest import read_bundles_manifest
+from jupyterlab_translate.manifest import write_bundles_manifest
+from jupyterlab_translate.utils import get_jobs
 
 
 # Minimal percentage needed to compile a PO file
@@ -18,6 +28,49 @@ COMPILATION_THRESHOLD = 0
 PACKAGE_PREFIX = "jupyterlab_language_pack_"
 
 
+def _is_up_to_date(po_path: Path, json_format: str) -> bool:
+    """Check if the outputs of a `.po` file are newer and match its manifest."""
+    outputs = [po_path.with_suffix(".mo"), po_path.with_suffix(".json")]
+    if not all(output.is_file() for output in outputs):
+        return False
+
+    po_mtime = po_path.stat().st_mtime_ns
+    manifest = read_bundles_manifest(po_path.parent.parent)
+    for output in outputs:
+        stat = output.stat()
+        info = manifest.get(f"{LC_MESSAGES}/{output.name}")
+        if (
+            stat.st_mtime_ns < po_mtime
+            or info is None
+            or info["size"] != stat.st_size
+            or info["sha256"] != hash_file(output)
+        ):
+            return False
+
+    return json_format_of(outputs[1]) == json_format
+
+
+def _compile_po_file(po_path: Path, json_format: str) -> Optional[float]:
+    """
+    Compile a `.po` file in place if it is translated enough.
+
+    Args:
+        po_path: PO file path
+        json_format: Bundle layout; one of ``JSON_FORMATS``
+    Returns:
+        The translated percentage or None if the outputs are up to date
+    """
+    if _is_up_to_date(po_path, json_format):
+        return None
+
+    # The same parse computes the statistics and both outputs
+    po = read_catalog(po_path)
+    percent_translated = po.percent_translated()
+    if percent_translated >= COMPILATION_THRESHOLD:
+        write_catalog(po, po_path, po_path.stem, merge=False, json_format=json_format)
+    return percent_translated
+
+
 class JupyterLanguageBuildHook(BuildHookInterface):
     """Hatch build plugin to package Jupyter language pack."""
 
@@ -54,6 +107,10 @@ class JupyterLanguageBuildHook(BuildHookInterface):
         ):
             bundle.unlink()
 
+        manifest = messages_folder.parent / BUNDLES_MANIFEST
+        if manifest.exists():
+            manifest.unlink()
+
     def initialize(self, version: str, build_data: dict[str, Any]) -> None:
         """This occurs immediately before each build.
 
@@ -65,21 +122,29 @@ class JupyterLanguageBuildHook(BuildHookInterface):
             return
 
         if self.target_name == "wheel":
+            json_format = self.config.get("json-format", "pretty")
             po_files = list(filter(lambda f: f.is_file(), messages_folder.glob("*.po")))
-            for file in po_files:
-                po = polib.pofile(str(file))
-                percent_translated = po.percent_translated()
+            compile_file = partial(_compile_po_file, json_format=json_format)
+            jobs = min(get_jobs(self.config.get("jobs")), len(po_files))
+            if jobs <= 1:
+                results = list(map(compile_file, po_files))
+            else:
+                with ProcessPoolExecutor(max_workers=jobs) as executor:
+                    results = list(executor.map(compile_file, po_files))
 
-                if percent_translated >= COMPILATION_THRESHOLD:
+            for file, percent_translated in zip(po_files, results):
+                if percent_translated is None:
+                    self.app.display_info(f"{locale_name} {file.stem} up to date")
+                elif percent_translated >= COMPILATION_THRESHOLD:
                     self.app.display_info(
-                        f"{locale_name} {file.stem} {percent_translated}% compiling...",
+                        f"{locale_name} {file.stem} {percent_translated}% compiled",
                     )
-                    compile_po_file(file)
                 else:
                     self.app.display_info(
                         f"{locale_name} {file.stem} {percent_translated}% < {COMPILATION_THRESHOLD}%",
                     )
 
+            write_bundles_manifest(messages_folder.parent)
             self.app.display_success("Language translation bundles generated.")
         else:
             CROWDIN_API_KEY = os.environ.get("CROWDIN_API_KEY")
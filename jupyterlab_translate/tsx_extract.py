@@ -0,0 +1,817 @@
+# Copyright (c) Jupyter Development Team.
+# Distributed under the terms of the Modified BSD License.
+"""
+Native extractor of the translatable strings of TS(X) files.
+
+It is an alternative to the bundled gettext-extract that does not require
+Node.js. The source is tokenized and the ``trans.*`` calls listed in
+``GETTEXT_CONFIG`` are recognized on the token stream with the same rules
+as gettext-extractor:
+
+- the callee must match one of the configured expressions exactly,
+- the arguments must be string literals, template literals without
+  substitution or concatenations of those with ``+``,
+- comments on the lines preceding the call (or its statement) are kept,
+- the occurrences of a message are sorted as ``file:line`` strings.
+"""
+import bisect
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Match
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from .constants import GETTEXT_CONFIG
+
+# Token kinds
+NAME = "name"
+PUNCT = "punct"
+STRING = "string"
+# Opening brace of a JSX expression container
+JSX = "jsx"
+OTHER = "other"
+
+# Keywords followed by a parenthesized header of a statement
+STATEMENT_KEYWORDS = {"catch", "for", "if", "switch", "while", "with"}
+# Keywords after which an expression is expected
+EXPRESSION_KEYWORDS = {
+    "await",
+    "case",
+    "delete",
+    "do",
+    "else",
+    "in",
+    "instanceof",
+    "new",
+    "of",
+    "return",
+    "throw",
+    "typeof",
+    "void",
+    "yield",
+}
+
+PUNCTUATORS = re.compile(
+    r">>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|>>>|&&=|\|\|=|\?\?=|=>|==|!=|<=|>=|&&|\|\|"
+    r"|\?\?|\?\.(?!\d)|\+\+|--|\+=|-=|\*=|/=|%=|&=|\|=|\^=|\*\*|<<|>>|[^\s\w]"
+)
+IDENTIFIER = re.compile(r"[A-Za-z_$#\u0080-\uffff][\w$\u0080-\uffff]*")
+NUMBER = re.compile(
+    r"0[xXbBoO][\da-fA-F_]+n?|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d+)?n?"
+)
+JSX_NAME = re.compile(r"[\w$.:\-\u0080-\uffff]+")
+LINE_BREAK = re.compile(r"[\n\r\u2028\u2029]")
+ESCAPE = re.compile(r"\\(u\{[\da-fA-F]+\}|u[\da-fA-F]{4}|x[\da-fA-F]{2}|\r\n|[\s\S])")
+JSX_START = re.compile(r"<\s*(>|[A-Za-z_$][\w$.:\-]*\s*([^\s\w]|\w+))")
+JSX_CLOSING = re.compile(r"<\s*/")
+JSX_TEXT_END = re.compile(r"[{<]")
+LINE_COMMENT = re.compile(r"^//\s*(.*?)\s*$")
+BLOCK_COMMENT = re.compile(r"^/\*\s*(.*?)\s*\*/$", re.DOTALL)
+
+ESCAPES = {
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+    "0": "\0",
+}
+LINE_TERMINATORS = "\n\r\u2028\u2029"
+
+Token = Tuple[str, str, int, int]
+
+
+def _cook_escape(match: Match) -> str:
+    escape = match.group(1)
+    if escape[0] in "ux" and len(escape) > 1:
+        return chr(int(escape.strip("ux{}"), 16))
+    if escape == "\r\n" or escape in LINE_TERMINATORS:
+        # Line continuation
+        return ""
+    return ESCAPES.get(escape, escape)
+
+
+def _unescape(raw: str) -> str:
+    # Cook the raw content of a JavaScript string or template literal
+    if "\\" not in raw:
+        return raw
+
+    text = ESCAPE.sub(_cook_escape, raw)
+    # Glue UTF-16 surrogate pairs escaped as two \uXXXX
+    return text.encode("utf-16", "surrogatepass").decode("utf-16")
+
+
+class _Lexer:
+    """
+    Split a TS(X) source into tokens.
+
+    Only the tokens needed to recognize the calls are accurate; notably JSX
+    elements and template literals with substitutions are emitted as
+    ``OTHER`` tokens but for the embedded expressions.
+    """
+
+    def __init__(self, text: str, jsx: bool):
+        self.text = text
+        self.jsx = jsx
+        self.pos = 0
+        self.tokens: List[Token] = []
+
+    def tokenize(self) -> List[Token]:
+        if self.text.startswith("#!"):
+            self.pos = self._line_end(0)
+        self._scan()
+        return self.tokens
+
+    def _emit(self, kind: str, value: str, start: int) -> None:
+        self.tokens.append((kind, value, start, self.pos))
+
+    def _line_end(self, pos: int) -> int:
+        match = LINE_BREAK.search(self.text, pos)
+        return match.start() if match else len(self.text)
+
+    def _skip_trivia(self) -> None:
+        text = self.text
+        while self.pos < len(text):
+            ch = text[self.pos]
+            if ch.isspace() or ch == "\ufeff":
+                self.pos += 1
+            elif text.startswith("//", self.pos):
+                self.pos = self._line_end(self.pos)
+            elif text.startswith("/*", self.pos):
+                end = text.find("*/", self.pos + 2)
+                self.pos = len(text) if end < 0 else end + 2
+            else:
+                break
+
+    def _expression_expected(self) -> bool:
+        if not self.tokens:
+            return True
+        kind, value = self.tokens[-1][:2]
+        if kind == NAME:
+            return value in EXPRESSION_KEYWORDS
+        if kind in (PUNCT, JSX):
+            return value not in (")", "]", "}")
+        return False
+
+    def _scan(self, until_brace: bool = False) -> None:
+        text = self.text
+        depth = 0
+        while True:
+            self._skip_trivia()
+            if self.pos >= len(text):
+                return
+
+            start = self.pos
+            ch = text[start]
+            if ch in "'\"":
+                self._string(ch)
+            elif ch == "`":
+                self._template()
+            elif ch == "/" and self._expression_expected() and self._regex():
+                pass
+            elif ch == "<" and self.jsx and self._expression_expected() and self._jsx():
+                pass
+            else:
+                match = IDENTIFIER.match(text, start)
+                if match:
+                    self.pos = match.end()
+                    self._emit(NAME, match.group(), start)
+                    continue
+                match = NUMBER.match(text, start)
+                if match:
+                    self.pos = match.end()
+                    self._emit(OTHER, match.group(), start)
+                    continue
+
+                value = PUNCTUATORS.match(text, start).group()
+                self.pos += len(value)
+                self._emit(PUNCT, value, start)
+                if value == "{":
+                    depth += 1
+                elif value == "}":
+                    if depth == 0 and until_brace:
+                        return
+                    depth = max(0, depth - 1)
+
+    def _string(self, quote: str) -> None:
+        text = self.text
+        start = self.pos
+        i = start + 1
+        while i < len(text) and text[i] != quote and text[i] not in "\n\r":
+            i += 2 if text[i] == "\\" else 1
+        self.pos = min(i + 1, len(text))
+        self._emit(STRING, _unescape(text[start + 1 : i]), start)
+
+    def _template(self) -> None:
+        text = self.text
+        start = chunk = self.pos
+        i = start + 1
+        substitution = False
+        while i < len(text):
+            if text[i] == "\\":
+                i += 2
+            elif text[i] == "`":
+                self.pos = i + 1
+                if substitution:
+                    self._emit(OTHER, text[chunk : self.pos], chunk)
+                else:
+                    raw = text[start + 1 : i].replace("\r\n", "\n").replace("\r", "\n")
+                    self._emit(STRING, _unescape(raw), start)
+                return
+            elif text.startswith("${", i):
+                substitution = True
+                self.pos = i
+                self._emit(OTHER, text[chunk:i], chunk)
+                self.pos = i + 2
+                self._emit(PUNCT, "{", i)
+                self._scan(until_brace=True)
+                i = chunk = self.pos
+            else:
+                i += 1
+        self.pos = len(text)
+
+    def _regex(self) -> bool:
+        text = self.text
+        start = self.pos
+        i = start + 1
+        in_class = False
+        while i < len(text) and text[i] not in LINE_TERMINATORS:
+            ch = text[i]
+            if ch == "\\":
+                i += 1
+            elif ch == "[":
+                in_class = True
+            elif ch == "]":
+                in_class = False
+            elif ch == "/" and not in_class:
+                match = IDENTIFIER.match(text, i + 1)
+                self.pos = match.end() if match else i + 1
+                self._emit(OTHER, text[start : self.pos], start)
+                return True
+            i += 1
+        return False
+
+    def _jsx(self) -> bool:
+        # Check `<` starts an element and not a generic arrow function `<T,>()`
+        text = self.text
+        match = JSX_START.match(text, self.pos)
+        if match is None or match.group(2) in (",", "extends"):
+            return False
+        self._jsx_element()
+        return True
+
+    def _jsx_element(self) -> None:
+        text = self.text
+        start = self.pos
+        self.pos += 1
+        self._emit(OTHER, "<", start)
+
+        # Opening tag
+        while True:
+            self._skip_trivia()
+            if self.pos >= len(text):
+                return
+            ch = text[self.pos]
+            if text.startswith("/>", self.pos):
+                self.pos += 2
+                self._emit(OTHER, "/>", self.pos - 2)
+                return
+            elif ch == ">":
+                self.pos += 1
+                break
+            elif ch == "{":
+                self.pos += 1
+                self._emit(JSX, "{", self.pos - 1)
+                self._scan(until_brace=True)
+            elif ch in "'\"":
+                end = text.find(ch, self.pos + 1)
+                self.pos = len(text) if end < 0 else end + 1
+            elif ch == "<":
+                self._jsx_element()
+            else:
+                match = JSX_NAME.match(text, self.pos)
+                self.pos = match.end() if match else self.pos + 1
+
+        # Children
+        while self.pos < len(text):
+            ch = text[self.pos]
+            if ch == "{":
+                self.pos += 1
+                self._emit(JSX, "{", self.pos - 1)
+                self._scan(until_brace=True)
+            elif ch == "<":
+                if JSX_CLOSING.match(text, self.pos):
+                    end = text.find(">", self.pos)
+                    self.pos = len(text) if end < 0 else end + 1
+                    self._emit(OTHER, "/>", self.pos - 1)
+                    return
+                self._jsx_element()
+            else:
+                end = JSX_TEXT_END.search(text, self.pos)
+                self.pos = end.start() if end else len(text)
+
+
+@lru_cache(maxsize=None)
+def _callees() -> Dict[Tuple[str, ...], Tuple[Dict[str, int], Tuple[bool, ...]]]:
+    # Map the callee segments to the arguments positions and comment options;
+    # like the gettext-extract CLI, comment options are read per parser
+    return {
+        tuple(parser["expression"].split(".")): (
+            parser["arguments"],
+            _comment_options(parser),
+        )
+        for parser in GETTEXT_CONFIG["js"]["parsers"]
+    }
+
+
+def _split_arguments(
+    tokens: List[Token], open_paren: int
+) -> Optional[Tuple[List[List[Token]], int]]:
+    # Split the call arguments on top-level commas; returns them with the
+    # index of the closing parenthesis
+    arguments = [[]]
+    depth = 0
+    for index in range(open_paren + 1, len(tokens)):
+        token = tokens[index]
+        kind, value = token[:2]
+        if kind in (PUNCT, JSX):
+            if value in "([{":
+                depth += 1
+            elif value in ")]}":
+                if depth == 0:
+                    return arguments, index
+                depth -= 1
+            elif value == "," and depth == 0:
+                arguments.append([])
+                continue
+        arguments[-1].append(token)
+    return None
+
+
+def _parse_concatenation(tokens: List[Token]) -> Optional[tuple]:
+    # Parse `term ('+' term)*` where `term := string | '(' expression ')'`
+    position = 0
+
+    def expression():
+        nonlocal position
+        node = term()
+        while node is not None and position < len(tokens):
+            if tokens[position][:2] != (PUNCT, "+"):
+                break
+            position += 1
+            right = term()
+            node = None if right is None else ("+", node, right)
+        return node
+
+    def term():
+        nonlocal position
+        if position >= len(tokens):
+            return None
+        kind, value = tokens[position][:2]
+        position += 1
+        if kind == STRING:
+            return ("string", value)
+        if (kind, value) == (PUNCT, "("):
+            node = expression()
+            if position < len(tokens) and tokens[position][:2] == (PUNCT, ")"):
+                position += 1
+                return ("()", node) if node is not None else None
+        return None
+
+    node = expression()
+    return node if position == len(tokens) else None
+
+
+def _strip_parentheses(node: tuple) -> tuple:
+    while node[0] == "()":
+        node = node[1]
+    return node
+
+
+def _concatenate(node: tuple) -> Optional[str]:
+    # Only string literals are allowed as operands; not parenthesized ones
+    parts = []
+    for operand in node[1:]:
+        if operand[0] == "string":
+            parts.append(operand[1])
+        elif _strip_parentheses(operand)[0] == "+":
+            part = _concatenate(_strip_parentheses(operand))
+            if part is None:
+                return None
+            parts.append(part)
+        else:
+            return None
+    return "".join(parts)
+
+
+def _literal(tokens: List[Token]) -> Optional[str]:
+    # Get the value of a string argument or None if it is not a literal
+    if len(tokens) == 1:
+        return tokens[0][1] if tokens[0][0] == STRING else None
+
+    node = _parse_concatenation(tokens)
+    if node is None:
+        return None
+    addition = _strip_parentheses(node)
+    if addition[0] == "+":
+        return _concatenate(addition)
+    return None
+
+
+def _comment_options(parser: Dict) -> Tuple[bool, bool, bool]:
+    # Comment options (other line leading, same line leading, same line
+    # trailing) of a parser with gettext-extractor defaults
+    options = parser.get("comments") or {}
+    keys = ("otherLineLeading", "sameLineLeading", "sameLineTrailing")
+    if all(options.get(key) is None for key in keys):
+        return (False, True, True)
+    return tuple(bool(options.get(key)) for key in keys)
+
+
+def _comment_ranges(
+    text: str, pos: int, trailing: bool, collecting: bool = False
+) -> List[Tuple[str, bool]]:
+    # Mirror `ts.get(Leading|Trailing)CommentRanges`; returns the comments with
+    # whether they are followed by a line break
+    collecting = collecting or trailing or pos == 0
+    ranges = []
+    pending = None
+    while pos < len(text):
+        ch = text[pos]
+        if ch in LINE_TERMINATORS:
+            if trailing:
+                break
+            pos += 2 if text.startswith("\r\n", pos) else 1
+            collecting = True
+            if pending is not None:
+                pending[1] = True
+        elif ch.isspace():
+            pos += 1
+        elif text.startswith("//", pos) or text.startswith("/*", pos):
+            start = pos
+            if text[pos + 1] == "/":
+                match = LINE_BREAK.search(text, pos)
+                pos = match.start() if match else len(text)
+            else:
+                end = text.find("*/", pos + 2)
+                pos = len(text) if end < 0 else end + 2
+            if collecting:
+                if pending is not None:
+                    ranges.append(tuple(pending))
+                pending = [text[start:pos], False]
+        else:
+            break
+    if pending is not None:
+        ranges.append(tuple(pending))
+    return ranges
+
+
+def _comment_text(comment: str) -> Optional[str]:
+    if comment.startswith("//"):
+        match = LINE_COMMENT.match(comment)
+    else:
+        match = None if "\n" in comment else BLOCK_COMMENT.match(comment)
+    return match.group(1) if match else None
+
+
+def _extract_comments(
+    text: str, span: Tuple[int, int], options: Tuple[bool, bool, bool], jsx: bool
+) -> List[str]:
+    other_line_leading, same_line_leading, same_line_trailing = options
+    start, end = span
+    comments = []
+    if other_line_leading or same_line_leading:
+        # Within JSX, the comments on the line of the call are collected too
+        for comment, own_line in _comment_ranges(text, start, False, jsx):
+            if (own_line and other_line_leading) or (
+                not own_line and same_line_leading
+            ):
+                comments.append(_comment_text(comment))
+    if same_line_trailing:
+        comments.extend(_comment_text(c) for c, _ in _comment_ranges(text, end, True))
+    return [c for c in comments if c]
+
+
+def _ends_statement(tokens: List[Token], index: int, lines: "_Lines") -> bool:
+    # Whether the expression ending at `index` ends its statement
+    if index + 1 >= len(tokens):
+        return True
+    kind, value, start = tokens[index + 1][:3]
+    if kind == PUNCT:
+        return value in (";", "}")
+    return lines.line(start) > lines.line(tokens[index][3])
+
+
+def _starts_statement(tokens: List[Token], index: int) -> bool:
+    # Whether the expression starting at `index` starts a statement
+    if index == 0:
+        return True
+    kind, value = tokens[index - 1][:2]
+    if kind == NAME:
+        return value in ("do", "else")
+    if kind != PUNCT:
+        return False
+    if value in (";", "{", "}"):
+        return True
+    if value == ")":
+        opener = _opener(tokens, index - 1)
+        return opener is not None and tokens[opener - 1][1] in STATEMENT_KEYWORDS
+    return False
+
+
+def _declaration_start(tokens: List[Token], equal: int) -> Optional[int]:
+    # Index of the first token of a single variable declaration statement
+    # `[export] const name[: type] = ...` or None
+    depth = 0
+    for index in range(equal - 1, max(-1, equal - 200), -1):
+        kind, value = tokens[index][:2]
+        if kind == PUNCT:
+            if value in ")]}>":
+                depth += 1
+            elif value in "([{<":
+                depth -= 1
+                if depth < 0:
+                    return None
+            elif value in (";", "=", ",") and depth == 0:
+                return None
+        elif kind == NAME and depth == 0 and value in ("const", "let", "var"):
+            if index + 1 >= equal or tokens[index + 1][0] != NAME:
+                return None
+            if index > 0 and tokens[index - 1][:2] in (
+                (NAME, "export"),
+                (NAME, "declare"),
+            ):
+                index -= 1
+            return index
+    return None
+
+
+def _opener(tokens: List[Token], index: int) -> Optional[int]:
+    # Index of the bracket enclosing the token `index` or matching it if
+    # `index` is a closing bracket
+    depth = 1 if tokens[index][1] in (")", "]", "}") else 0
+    for position in range(index - 1, -1, -1):
+        kind, value = tokens[position][:2]
+        if kind not in (PUNCT, JSX):
+            continue
+        if value in (")", "]", "}"):
+            depth += 1
+        elif value in ("(", "[", "{"):
+            if depth == 0:
+                return position
+            depth -= 1
+            if depth == 0 and tokens[index][1] in (")", "]", "}"):
+                return position
+    return None
+
+
+def _is_call_parenthesis(tokens: List[Token], index: int) -> bool:
+    if index == 0:
+        return False
+    kind, value = tokens[index - 1][:2]
+    if kind == NAME:
+        return value not in EXPRESSION_KEYWORDS
+    return kind in (STRING, OTHER) or value in (")", "]")
+
+
+def _on_separate_line(
+    tokens: List[Token], start: int, end: int, lines: "_Lines"
+) -> bool:
+    # Whether the list element spanning `start` to `end` is alone on its line
+    line = lines.line(tokens[start][2])
+    if tokens[start - 1][1] == "," and lines.line(tokens[start - 2][3]) == line:
+        return False
+    if (
+        end + 2 < len(tokens)
+        and tokens[end + 1][1] == ","
+        and tokens[end + 2][1] not in (")", "]", "}")
+        and lines.line(tokens[end + 2][2]) == line
+    ):
+        return False
+    return True
+
+
+def _skip_to(text: str, pos: int, character: str) -> int:
+    # Skip the blanks and `character` following `pos`
+    while pos < len(text):
+        if text[pos] == character:
+            return pos + 1
+        if text[pos] not in " \t\v\f":
+            break
+        pos += 1
+    return pos
+
+
+def _extraction_span(
+    text: str, tokens: List[Token], start: int, end: int, lines: "_Lines"
+) -> Tuple[int, int]:
+    """
+    Get the positions to look for the leading and trailing comments of a call.
+
+    The call spanning the tokens ``start`` to ``end`` is expanded to its
+    enclosing parentheses and statement and the list separator following it
+    is skipped like gettext-extractor does.
+    """
+    while (
+        start > 0
+        and end + 1 < len(tokens)
+        and tokens[start - 1][:2] == (PUNCT, "(")
+        and tokens[end + 1][:2] == (PUNCT, ")")
+        and not _is_call_parenthesis(tokens, start - 1)
+    ):
+        start -= 1
+        end += 1
+
+    previous = tokens[start - 1][:2] if start > 0 else None
+    following = tokens[end + 1][:2] if end + 1 < len(tokens) else None
+
+    statement = None
+    if _ends_statement(tokens, end, lines):
+        if previous in ((NAME, "return"), (NAME, "throw")):
+            statement = start - 1
+        elif previous == (PUNCT, "="):
+            statement = _declaration_start(tokens, start - 1)
+        elif _starts_statement(tokens, start):
+            statement = start
+    if statement is not None:
+        if following == (PUNCT, ";"):
+            end += 1
+        return (tokens[statement - 1][3] if statement > 0 else 0, tokens[end][3])
+
+    span_start = tokens[start - 1][3] if start > 0 else 0
+    span_end = tokens[end][3]
+    if previous is None or following is None:
+        return (span_start, span_end)
+
+    opener = _opener(tokens, start)
+    closers = {"(": ")", "[": "]", "{": "}"}
+    if opener is not None and following[1] in (",", closers[tokens[opener][1]]):
+        bracket = tokens[opener][1]
+        if previous[1] in ("(", "[", ","):
+            # Call argument or array element
+            if (bracket == "(" and _is_call_parenthesis(tokens, opener)) or (
+                bracket == "[" and not _is_call_parenthesis(tokens, opener)
+            ):
+                if _on_separate_line(tokens, start, end, lines):
+                    span_end = _skip_to(text, span_end, ",")
+            return (span_start, span_end)
+        if (
+            bracket == "{"
+            and previous == (PUNCT, ":")
+            and start - 2 > opener
+            and tokens[start - 3][1] in ("{", ",")
+        ):
+            # Object property
+            if _on_separate_line(tokens, start - 2, end, lines):
+                span_end = _skip_to(text, span_end, ",")
+            return (span_start, span_end)
+
+    if previous == (PUNCT, ":") and following[1] in (";", ")", "]", "}", ","):
+        # Last operand of a conditional expression
+        span_end = _skip_to(text, span_end, ";")
+
+    return (span_start, span_end)
+
+
+class _Lines:
+    """Line numbers lookup of a text."""
+
+    def __init__(self, text: str):
+        self._starts = [0] + [m.end() for m in re.finditer(r"\r\n?|\n", text)]
+
+    def line(self, pos: int) -> int:
+        return bisect.bisect_right(self._starts, pos)
+
+
+def _collate(text: str) -> Tuple:
+    # Approximate `String.localeCompare`: spaces, punctuation, digits and then
+    # letters ignoring the case but for ties where lower case comes first
+    primary = [
+        (3 if c.isalpha() else 2 if c.isdigit() else 0 if c.isspace() else 1, c)
+        for c in text.casefold()
+    ]
+    return (primary, text.swapcase())
+
+
+def _sort_key(message: Dict) -> Tuple:
+    # Order of gettext-extractor: by context and then by text
+    return (_collate(message.get("msgctxt", "")), _collate(message["msgid"]))
+
+
+def extract(source: str, file_name: str, jsx: Optional[bool] = None) -> List[Dict]:
+    """
+    Extract the translatable strings of a TS(X) source.
+
+    Args:
+        source: Source code
+        file_name: File name used in the occurrences
+        jsx: Whether the source contains JSX; default to true for ``.tsx`` files
+    Returns:
+        Entries ordered like gettext-extractor does
+    """
+    if jsx is None:
+        jsx = file_name.endswith(".tsx")
+    tokens = _Lexer(source, jsx).tokenize()
+    lines = _Lines(source)
+    callees = _callees()
+    longest = max(map(len, callees))
+
+    messages = OrderedDict()
+    for index, (kind, value, start, _) in enumerate(tokens):
+        if kind != NAME or (
+            index > 0 and tokens[index - 1][:2] in ((PUNCT, "."), (PUNCT, "?."))
+        ):
+            continue
+
+        # Collect the callee `a.b.c` and check it is called
+        segments = [value]
+        cursor = index + 1
+        while (
+            len(segments) <= longest
+            and cursor + 1 < len(tokens)
+            and tokens[cursor][:2] in ((PUNCT, "."), (PUNCT, "?."))
+            and tokens[cursor + 1][0] == NAME
+        ):
+            segments.append(tokens[cursor + 1][1])
+            cursor += 2
+        callee = callees.get(tuple(segments))
+        if callee is None or cursor >= len(tokens):
+            continue
+        arguments_spec, comment_options = callee
+        if tokens[cursor][:2] != (PUNCT, "(") or (
+            index > 0 and tokens[index - 1][:2] == (NAME, "new")
+        ):
+            continue
+        split = _split_arguments(tokens, cursor)
+        if split is None:
+            continue
+        arguments, end = split
+
+        def argument(name):
+            position = arguments_spec.get(name)
+            if position is None or position >= len(arguments):
+                return None
+            return _literal(arguments[position])
+
+        text = argument("text")
+        plural = argument("textPlural")
+        if text is None or ("textPlural" in arguments_spec and plural is None):
+            continue
+        if text == "":
+            continue
+        context = argument("context") or ""
+
+        jsx_child = (
+            index > 0
+            and tokens[index - 1][0] == JSX
+            and end + 1 < len(tokens)
+            and tokens[end + 1][:2] == (PUNCT, "}")
+        )
+        comments = _extract_comments(
+            source,
+            _extraction_span(source, tokens, index, end, lines),
+            comment_options,
+            jsx_child,
+        )
+        occurrence = (file_name, str(lines.line(start)))
+
+        message = messages.get((context, text))
+        if message is None:
+            message = messages[(context, text)] = {"msgid": text, "occurrences": []}
+            if context:
+                message["msgctxt"] = context
+        if plural and "msgid_plural" not in message:
+            message["msgid_plural"] = plural
+            message["msgstr_plural"] = {0: "", 1: ""}
+        if occurrence not in message["occurrences"]:
+            message["occurrences"].append(occurrence)
+        if comments:
+            known = message.get("comment", "").splitlines()
+            known.extend(c for c in comments if c not in known)
+            message["comment"] = "\n".join(known)
+
+    for message in messages.values():
+        # gettext-extractor sorts the references as `file:line` strings
+        message["occurrences"].sort(key=lambda o: f"{o[0]}:{o[1]}")
+    return sorted(messages.values(), key=_sort_key)
+
+
+def extract_file(path: Union[str, Path], root: Union[str, Path]) -> List[Dict]:
+    """
+    Extract the translatable strings of a TS(X) file.
+
+    Args:
+        path: File path
+        root: Folder the occurrences are relative to
+    Returns:
+        Entries ordered like gettext-extractor does
+    """
+    path = Path(path)
+    source = path.read_text(encoding="utf-8")
+    return extract(source, path.relative_to(root).as_posix())
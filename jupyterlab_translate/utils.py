@@ -2,20 +2,31 @@
 # Distributed under the terms of the Modified BSD License.
 """
 """
+import configparser
+import datetime
+import hashlib
+import io
 import json
 import os
 import re
-import shutil
 import subprocess
 import sys
-import tempfile
+import tokenize
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from functools import partial
 from itertools import chain
+from operator import attrgetter
 from pathlib import Path
+from typing import Any
+from typing import BinaryIO
+from typing import Callable
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
-from typing import Pattern
 from typing import Set
 from typing import Tuple
 from typing import Union
@@ -23,22 +34,125 @@ from typing import Union
 import babel
 import copier
 import polib
-
+from babel.messages.catalog import Catalog
+from babel.messages.catalog import Message
+from babel.messages.extract import DEFAULT_KEYWORDS
+from babel.messages.extract import extract_from_file
+from babel.messages.extract import extract_python
+from babel.messages.pofile import read_po
+from babel.messages.pofile import write_po
+from babel.util import LOCALTZ
+
+if sys.version_info < (3, 11):
+    import tomli as tomllib
+else:
+    import tomllib
+
+from . import gettext_extract
+from . import tsx_extract
+from .cache import ExtractionCache
+from .cache import hash_file
+from .cache import RelativePaths
 from .constants import GETTEXT_CONFIG
 from .constants import LC_MESSAGES
 from .constants import LOCALE_FOLDER
 from .constants import TEMPLATE_REF
 from .constants import TEMPLATE_URL
+from .constants import TSX_ENGINES
+from .converters import compile_catalog_file
+from .fuzzy import add_fuzzy_matches
+from .fuzzy import FUZZY_CUTOFF
+from .locales import check_locale
+from .locales import normalize_locale
+from .manifest import BUNDLES_MANIFEST
+from .manifest import write_bundles_manifest
 
 # Constants
 HERE = Path(__file__).parent
+# Minimal number of files per worker process for parallel extraction
+MIN_FILES_PER_WORKER = 16
+# Default pattern of the hatch regex version source
+HATCH_VERSION_PATTERN = r"(?i)^(__version__|VERSION) *= *(['\"])v?(?P<version>.+?)\2"
 
 # --- Helpers
 # ----------------------------------------------------------------------------
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+# The readers are memoized per file modification time
+@lru_cache(maxsize=None)
+def _read_toml(path: Path, mtime: int) -> Dict:
+    return tomllib.loads(path.read_text(encoding="utf-8"))
+
+
+@lru_cache(maxsize=None)
+def _read_setup_cfg(path: Path, mtime: int) -> Dict[str, str]:
+    config = configparser.ConfigParser()
+    config.read(path, encoding="utf-8")
+    return dict(config["metadata"]) if config.has_section("metadata") else {}
+
+
+@lru_cache(maxsize=None)
+def _read_version_file(path: Path, mtime: int, pattern: str) -> Optional[str]:
+    # Same as hatch regex version source
+    match = re.search(pattern, path.read_text(encoding="utf-8"), flags=re.MULTILINE)
+    return match.group("version") if match else None
+
+
+@lru_cache(maxsize=None)
+def _read_package_json(path: Path, mtime: int) -> str:
+    return json.loads(path.read_text()).get("version", "")
+
+
+def _static_python_version(repo_root_path: Path) -> Optional[str]:
+    """
+    Read the version of a Python project from its configuration files.
+
+    Args:
+        repo_root_path: Path to the Python project
+    Returns:
+        The version or None if it is computed dynamically
+    """
+    pyproject = repo_root_path / "pyproject.toml"
+    mtime = _mtime(pyproject)
+    if mtime is not None:
+        config = _read_toml(pyproject, mtime)
+        metadata = config.get("project", {})
+        if "version" in metadata and "version" not in metadata.get("dynamic", []):
+            return str(metadata["version"])
+
+        hatch = config.get("tool", {}).get("hatch", {}).get("version", {})
+        if hatch.get("source", "regex") == "regex" and "path" in hatch:
+            path = repo_root_path / hatch["path"]
+            pattern = hatch.get("pattern", True)
+            mtime = _mtime(path)
+            if mtime is not None:
+                return _read_version_file(
+                    path, mtime, HATCH_VERSION_PATTERN if pattern is True else pattern
+                )
+
+    setup_cfg = repo_root_path / "setup.cfg"
+    mtime = _mtime(setup_cfg)
+    if mtime is not None:
+        version = _read_setup_cfg(setup_cfg, mtime).get("version", "").strip()
+        if version and not version.startswith(("attr:", "file:")):
+            return version
+
+    return None
+
+
 def get_version(repo_root_path: Path, project: str) -> str:
     """
     Get the version of a language pack
 
+    The version is read from the Python project configuration files, then
+    from the ``package.json`` file of the project. ``setup.py`` or ``hatch``
+    are run only if the Python project version is dynamic.
+
     Args:
         repo_root_path: Path to the language pack
         project: Project name
@@ -48,29 +162,33 @@ def get_version(repo_root_path: Path, project: str) -> str:
     """
     package = repo_root_path / project
 
-    version = ""
     # Look for python version
-    try:
-        output = subprocess.check_output(
-            [sys.executable, "setup.py", "--version"]
-            if (repo_root_path / "setup.py").exists()
-            else [sys.executable, "-m", "hatch", "version"],
-            cwd=repo_root_path,
-            encoding="utf-8",
-        ).strip()
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to get the Python package version for '{package!s}.")
-        print(e)
-    else:
-        version = output.splitlines()[-1]
+    version = _static_python_version(repo_root_path)
+    if version is None and (
+        (repo_root_path / "setup.py").exists()
+        or (repo_root_path / "pyproject.toml").exists()
+    ):
+        try:
+            output = subprocess.check_output(
+                [sys.executable, "setup.py", "--version"]
+                if (repo_root_path / "setup.py").exists()
+                else [sys.executable, "-m", "hatch", "version"],
+                cwd=repo_root_path,
+                encoding="utf-8",
+            ).strip()
+        except subprocess.CalledProcessError as e:
+            print(f"Failed to get the Python package version for '{package!s}.")
+            print(e)
+        else:
+            version = output.splitlines()[-1]
+    version = version or ""
 
     # Look for npm version
     if not version:
         pkg_path = package / "package.json"
-
-        if pkg_path.is_file():
-            data = json.loads(pkg_path.read_text())
-            version = data.get("version", "")
+        mtime = _mtime(pkg_path)
+        if mtime is not None:
+            version = _read_package_json(pkg_path, mtime)
 
     # Look for git version
     if not version and repo_root_path.exists():
@@ -108,6 +226,7 @@ def create_new_language_pack(
     if not check_locale(locale):
         raise Exception("Invalid locale!")
 
+    locale = normalize_locale(locale)
     try:
         loc = babel.Locale.parse("nb_NO" if locale == "no_NO" else locale)
         language_name = loc.english_name
@@ -125,22 +244,6 @@ def create_new_language_pack(
     )
 
 
-def check_locale(locale: str) -> bool:
-    """Check if a locale is a valid value."""
-    # Add exceptions
-    if locale in {"ach_UG", "no_NO"}:
-        return True
-
-    value = False
-    try:
-        babel.Locale.parse(locale)
-        value = True
-    except Exception as e:
-        print(str(e))
-
-    return value
-
-
 def find_locales(output_dir: Path) -> Tuple[str]:
     """
     Find available locales on the `output_dir` folder.
@@ -162,29 +265,134 @@ def find_locales(output_dir: Path) -> Tuple[str]:
     return tuple(sorted(locales))
 
 
+def get_jobs(jobs: Optional[int] = None) -> int:
+    """
+    Get the number of parallel jobs to use.
+
+    Args:
+        jobs: Requested number of jobs; default to the number of CPUs
+    Returns:
+        Number of jobs
+    """
+    return max(1, jobs or os.cpu_count() or 1)
+
+
+def split_files(files: List[Path], jobs: int) -> List[List[Path]]:
+    """
+    Split sorted files in contiguous slices, one per job.
+
+    Files of the same package being contiguous, each job mostly extracts
+    whole packages.
+
+    Args:
+        files: Sorted files
+        jobs: Number of jobs
+    Returns:
+        At most ``jobs`` lists of files
+    """
+    size = max(1, -(-len(files) // jobs))
+    return [files[i : i + size] for i in range(0, len(files), size)]
+
+
+def map_files(
+    function: Callable[[Path], Any], files: List[Path], jobs: Optional[int] = None
+) -> List[Any]:
+    """
+    Apply a function to files, in worker processes if there are enough files.
+
+    Args:
+        function: Picklable function called with each file
+        files: Files to process
+        jobs: Number of worker processes; default to the number of CPUs
+    Returns:
+        Results ordered as ``files``
+    """
+    jobs = min(get_jobs(jobs), len(files) // MIN_FILES_PER_WORKER)
+    if jobs <= 1:
+        return list(map(function, files))
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        chunksize = max(1, len(files) // (jobs * 4))
+        return list(executor.map(function, files, chunksize=chunksize))
+
+
 # --- Find source files
 # ----------------------------------------------------------------------------
 def find_packages_source_files(
-    packages_path: Union[str, Path]
+    packages_path: Union[str, Path], use_git: bool = False
 ) -> Dict[str, List[Path]]:
     """
     List packages source files.
 
     Args:
         packages_path: Path to the packages root directory
+        use_git: List the files known to git if the packages are in a git checkout
 
     Returns:
         Mapping (package name, source files list)
     """
+    packages_path = Path(packages_path)
+    git_files = _git_files(packages_path) if use_git else None
+    if git_files is not None:
+        # List the files known to git once and split them per package
+        packages_git_files = {}
+        for f in git_files:
+            parts = f.relative_to(packages_path).parts
+            if len(parts) > 1:
+                packages_git_files.setdefault(parts[0], []).append(f)
+
     package_files = OrderedDict()
-    for pkg in Path(packages_path).iterdir():
-        files = find_source_files(pkg)
+    for pkg in sorted(packages_path.iterdir()):
+        if git_files is None:
+            files = find_source_files(pkg)
+        else:
+            files = find_source_files(
+                pkg, git_files=packages_git_files.get(pkg.name, [])
+            )
         if files:
             package_files[pkg.name] = files
 
     return package_files
 
 
+def _git_files(path: Path) -> Optional[List[Path]]:
+    # Tracked and untracked but not ignored files; None if not in a git checkout
+    cmd = ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"]
+    try:
+        output = subprocess.check_output(cmd, cwd=path, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return [path / f for f in sorted(set(output.decode("utf-8").split("\0"))) if f]
+
+
+def _walk_files(
+    path: Path, extensions: Tuple[str, ...], skip_folders: Set[str]
+) -> List[Path]:
+    # Depth-first walk not descending in the skipped folders
+    all_files = []
+    folders = [path]
+    while folders:
+        folder = folders.pop()
+        try:
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subfolders = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in skip_folders:
+                    subfolders.append(entry.path)
+            elif entry.name.endswith(extensions) and entry.is_file():
+                all_files.append(Path(entry.path))
+
+        folders.extend(reversed(subfolders))
+
+    return all_files
+
+
 def find_source_files(
     path: Path,
     extensions: Set[str] = {".ts", ".tsx", ".py"},
@@ -196,84 +404,138 @@ def find_source_files(
         ".git",
         ".ipynb_checkpoints",
     },
-):
+    use_git: bool = False,
+    git_files: Optional[List[Path]] = None,
+) -> List[Path]:
     """
     Find source files in given `path`.
 
+    Files are listed in a single pass over the tree, the skipped folders
+    are not walked through.
+
     Args:
         path: Path to introspect
         extensions: Set of extensions to list
         skip_folders: Set of folders to ignore
+        use_git: List the files known to git if `path` is in a git checkout
+        git_files: Files known to git within `path`, if already listed
 
     Returns
         List of files found
     """
+    path = Path(path)
+    # Like their subfolders, the skipped folders themselves are not listed
+    if path.name in skip_folders:
+        return []
+
+    extensions = tuple(extensions)
+    if git_files is None and use_git and path.is_dir():
+        git_files = _git_files(path)
+    if git_files is None:
+        return _walk_files(path, extensions, skip_folders)
+
+    return [
+        f
+        for f in git_files
+        if f.name.endswith(extensions)
+        and skip_folders.isdisjoint(f.relative_to(path).parts[:-1])
+        and f.is_file()
+    ]
+
+
+def find_tsx_files(path: Path) -> List[Path]:
+    """
+    Find the TS(X) files parsed by `gettext-extract` in given `path`.
+
+    This mirrors the glob defined in ``GETTEXT_CONFIG``: hidden folders and
+    files, the top-level ``examples`` and ``node_modules`` folders and the
+    ``*.spec.ts`` files are ignored.
+
+    Args:
+        path: Path to introspect
+
+    Returns
+        Sorted list of files found
+    """
+    path = Path(path)
     all_files = []
-    for ext in extensions:
-        for f in path.rglob(f"*{ext}"):
-            parents = set(map(lambda p: p.name, f.parents))
-            if len(parents.intersection(skip_folders)) > 0:
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        if Path(root) == path:
+            dirs[:] = [d for d in dirs if d not in {"examples", "node_modules"}]
+        for name in files:
+            if name.startswith(".") or name.endswith(".spec.ts"):
                 continue
+            if name.endswith((".ts", ".tsx")):
+                all_files.append(Path(root) / name)
 
-            all_files.append(f)
-
-    return all_files
+    return sorted(all_files)
 
 
 # --- .pot and .po generation
 # ----------------------------------------------------------------------------
-def extract_tsx_strings(input_path: Union[str, Path]) -> List[Dict]:
-    """
-    Use gettext-extract to extract strings from TS(X) files.
+def _glob_escape(path: str) -> str:
+    return re.sub(r"([\\*?\[\](){}!+@,])", r"\\\1", path)
 
-    Args:
-        input_path: path to look for strings.
 
-    Returns:
-        List of translatable strings
-    """
-    input_path = Path(input_path).expanduser()
+def _entry_to_dict(entry: polib.POEntry) -> Dict:
+    data = {"msgid": entry.msgid, "occurrences": entry.occurrences}
 
-    with tempfile.NamedTemporaryFile("w+", suffix=".pot") as output:
-        config = GETTEXT_CONFIG.copy()
-        config["output"] = output.name
+    if entry.msgid_plural:
+        data["msgid_plural"] = entry.msgid_plural
+        data["msgstr_plural"] = entry.msgstr_plural
 
-        with tempfile.NamedTemporaryFile("w+", suffix=".json") as config_file:
-            json.dump(config, config_file)
-            config_file.seek(0)  # Rewind to file beginning
+    if entry.msgctxt:
+        data["msgctxt"] = entry.msgctxt
 
-            subprocess.run(["cat", config_file.name])
-            cmd = ["gettext-extract", "--config", config_file.name]
-            subprocess.check_call(cmd, cwd=input_path)
+    if entry.comment:
+        data["comment"] = entry.comment
 
-        # Fix the missing format
-        output_path = Path(output.name)
-        output_path.write_text("#, fuzzy\n" + output_path.read_text())
+    if entry.tcomment:
+        data["tcomment"] = entry.tcomment
 
-        entries = []
-        pot = polib.pofile(str(output_path), wrapwidth=100000)
-        for entry in pot:
-            occurrences = entry.occurrences
+    if entry.flags:
+        data["flags"] = entry.flags
 
-            data = {"msgid": entry.msgid, "occurrences": occurrences}
+    if entry.encoding:
+        data["encoding"] = entry.encoding
 
-            if entry.msgid_plural:
-                data["msgid_plural"] = entry.msgid_plural
-                data["msgstr_plural"] = entry.msgstr_plural
+    if entry.obsolete:
+        data["obsolete"] = entry.obsolete
 
-            if entry.msgctxt:
-                data["msgctxt"] = entry.msgctxt
+    return data
 
-            if entry.comment:
-                data["comment"] = entry.comment
 
-            if entry.encoding:
-                data["encoding"] = entry.encoding
+def extract_tsx_strings(
+    input_path: Union[str, Path], files: Optional[List[Path]] = None
+) -> List[Dict]:
+    """
+    Use gettext-extract to extract strings from TS(X) files.
 
-            if entry.obsolete:
-                data["obsolete"] = entry.obsolete
+    Args:
+        input_path: path to look for strings.
+        files: optional list of files within ``input_path`` to restrict the
+            extraction to.
 
-            entries.append(data)
+    Returns:
+        List of translatable strings
+    """
+    input_path = Path(input_path).expanduser()
+
+    config = json.loads(json.dumps(GETTEXT_CONFIG))
+    if files is not None:
+        patterns = [
+            _glob_escape(Path(f).relative_to(input_path).as_posix()) for f in files
+        ]
+        config["js"]["glob"]["pattern"] = (
+            patterns[0] if len(patterns) == 1 else "{" + ",".join(patterns) + "}"
+        )
+
+    # Fix the missing format
+    content = "#, fuzzy\n" + gettext_extract.extract(input_path, config)
+
+    pot = polib.pofile(content, wrapwidth=100000)
+    entries = [_entry_to_dict(entry) for entry in pot]
 
     return entries
 
@@ -319,7 +581,7 @@ DEFAULT_SCHEMA_SELECTORS = {
 }
 
 
-def _prepare_schema_patterns(schema: dict) -> Dict[Pattern, str]:
+def _schema_selectors(schema: dict) -> Tuple[Tuple[str, str], ...]:
     selectors = {
         **DEFAULT_SCHEMA_SELECTORS,
         **{
@@ -329,127 +591,574 @@ def _prepare_schema_patterns(schema: dict) -> Dict[Pattern, str]:
             )
         },
     }
-    return {
-        re.compile("^/" + pattern + "$"): context
-        for pattern, context in selectors.items()
+    return tuple(selectors.items())
+
+
+@lru_cache(maxsize=None)
+def _compile_schema_selectors(
+    selectors: Tuple[Tuple[str, str], ...]
+) -> Callable[[str], Optional[str]]:
+    """
+    Compile schema selectors into a single matcher.
+
+    The selectors are combined in one regular expression; the first matching
+    selector in order wins. Matchers are cached as most schemas only use the
+    default selectors.
+
+    Args:
+        selectors: Tuple of (selector, translation context)
+    Returns:
+        Function returning the translation context of a path or None
+    """
+    pattern = re.compile(
+        "|".join(
+            f"(?P<_selector{index}>^/{selector}$)"
+            for index, (selector, _) in enumerate(selectors)
+        )
+    )
+    contexts = {
+        f"_selector{index}": context for index, (_, context) in enumerate(selectors)
     }
+    # Most paths are rejected by looking at their last segment only if all
+    # selectors end with a literal one
+    names = set()
+    for selector, _ in selectors:
+        name = selector.rsplit("/", 1)[-1]
+        if "|" in selector or not re.fullmatch(r"(?:[\w-]|\\\.)+", name):
+            names = None
+            break
+        names.add(name.replace("\\.", "."))
+
+    def match(path: str) -> Optional[str]:
+        if names is not None and path.rsplit("/", 1)[-1] not in names:
+            return None
+        matched = pattern.fullmatch(path)
+        return None if matched is None else contexts[matched.lastgroup]
+
+    return match
 
 
 def _extract_schema_strings(
     schema: dict,
     ref_path: str,
     prefix: str = "",
-    to_translate: Dict[Pattern, str] = None,
-):
+    to_translate: Optional[Callable[[str], Optional[str]]] = None,
+) -> Iterator[Dict]:
     if to_translate is None:
-        to_translate = _prepare_schema_patterns(schema)
-
-    entries = []
+        to_translate = _compile_schema_selectors(_schema_selectors(schema))
 
     for key, value in schema.items():
         path = prefix + "/" + key
 
         if isinstance(value, str):
-            matched = False
-            for pattern, context in to_translate.items():
-                if pattern.fullmatch(path):
-                    matched = True
-                    break
-            if matched:
-                entries.append(
-                    dict(
-                        msgctxt=context,
-                        msgid=value,
-                        occurrences=[(ref_path, path)],
-                    )
-                )
+            context = to_translate(path)
+            if context is not None:
+                yield dict(msgctxt=context, msgid=value, occurrences=[(ref_path, path)])
         elif isinstance(value, dict):
-            entries.extend(
-                _extract_schema_strings(
-                    value, ref_path, prefix=path, to_translate=to_translate
-                )
+            yield from _extract_schema_strings(
+                value, ref_path, prefix=path, to_translate=to_translate
             )
         elif isinstance(value, list):
             for i, element in enumerate(value):
                 if not isinstance(element, dict):
                     continue
-                entries.extend(
-                    _extract_schema_strings(
-                        element,
-                        ref_path,
-                        prefix=path + "[" + str(i) + "]",
-                        to_translate=to_translate,
-                    )
+                yield from _extract_schema_strings(
+                    element,
+                    ref_path,
+                    prefix=path + "[" + str(i) + "]",
+                    to_translate=to_translate,
                 )
-    return entries
 
 
-def extract_schema_strings(input_path: Union[str, Path]) -> List[Dict]:
+def _manifest_stamp(path: Path) -> str:
+    stat = path.stat()
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _read_schema_dir(path: Path) -> Optional[str]:
+    # Most manifests do not declare schemas; skip parsing them
+    content = path.read_text()
+    if "schemaDir" not in content:
+        return None
+    return json.loads(content).get("jupyterlab", {}).get("schemaDir", None)
+
+
+def find_schema_files(
+    input_path: Union[str, Path], cache: Optional[ExtractionCache] = None
+) -> List[Path]:
     """
-    Use gettext-extract to extract strings from JSON schema files.
+    Find the JSON schema files declared by the packages in `input_path`.
+
     Args:
-        input_path:
+        input_path: Path to introspect
+        cache: Optional cache of the ``schemaDir`` of the package manifests;
+            manifests are read again only if their modification time or
+            size changed
     Returns
-        List of translatable strings
+        List of schema files
     """
     input_paths = find_source_files(Path(input_path), extensions=("package.json",))
     schema_paths: List[Path] = []
 
     for path in input_paths:
-        if path.is_file():
-            data = json.loads(path.read_text())
-
-            schema_dir = data.get("jupyterlab", {}).get("schemaDir", None)
-            if schema_dir is not None:
-                schema_path = path.parent / schema_dir
-                if schema_path.is_dir():
-                    for p in schema_path.rglob("*.json"):
+        if cache is None:
+            schema_dir = _read_schema_dir(path)
+        else:
+            stamp = _manifest_stamp(path)
+            cached = cache.get_value("manifest", path, stamp)
+            if cached is None:
+                cached = {"schemaDir": _read_schema_dir(path)}
+                cache.set_value("manifest", path, stamp, cached)
+            schema_dir = cached["schemaDir"]
+
+        if schema_dir is not None:
+            schema_path = path.parent / schema_dir
+            if schema_path.is_dir():
+                for p in schema_path.rglob("*.json"):
+                    if p.is_file():
                         schema_paths.append(p)
 
+    if cache is not None:
+        cache.prune("manifest", input_paths)
+
+    return schema_paths
+
+
+def extract_schema_file(path: Path, input_path: Union[str, Path]) -> List[Dict]:
+    """
+    Extract strings from a JSON schema file.
+
+    Args:
+        path: Schema file path
+        input_path: Root path the occurrences are relative to
+    Returns
+        List of translatable strings
+    """
+    schema = json.loads(path.read_text())
+    ref_path = "/{!s}".format(path.relative_to(input_path))
+    return list(_extract_schema_strings(schema, ref_path))
+
+
+def extract_schema_strings(input_path: Union[str, Path]) -> List[Dict]:
+    """
+    Use gettext-extract to extract strings from JSON schema files.
+    Args:
+        input_path:
+    Returns
+        List of translatable strings
+    """
     entries = []
-    for path in schema_paths:
-        if path.is_file():
-            data = path.read_text()
-            schema = json.loads(data)
-            ref_path = "/{!s}".format(path.relative_to(input_path))
-            entries.extend(_extract_schema_strings(schema, ref_path))
+    for path in find_schema_files(input_path):
+        entries.extend(extract_schema_file(path, input_path))
 
     return entries
 
 
+# Prefix of the Babel keywords standing for the dotted functions
+KEYWORD_PREFIX = "_jupyterlab_translate_"
+
+
+@lru_cache(maxsize=None)
+def _python_functions() -> Dict[Tuple[str, ...], Tuple[str, Tuple]]:
+    """
+    Get the functions listed in `pybabel_config.cfg`.
+
+    The arguments specification is the one used for TS(X) files.
+
+    Returns
+        Mapping (dotted name parts, (Babel keyword, arguments specification))
+    """
+    specs = {}
+    for parser in GETTEXT_CONFIG["js"]["parsers"]:
+        name = parser["expression"].rsplit(".", 1)[-1]
+        arguments = parser["arguments"]
+        spec = []
+        if "context" in arguments:
+            spec.append((arguments["context"] + 1, "c"))
+        spec.append(arguments["text"] + 1)
+        if "textPlural" in arguments:
+            spec.append(arguments["textPlural"] + 1)
+        specs[name] = tuple(spec)
+
+    mapping = configparser.ConfigParser()
+    mapping.read(HERE / "pybabel_config.cfg")
+
+    functions = {}
+    for section in mapping.sections():
+        for function in mapping[section].get("extract_messages", "").split(","):
+            function = function.strip()
+            if function:
+                keyword = KEYWORD_PREFIX + str(len(functions))
+                parts = tuple(function.split("."))
+                functions[parts] = (keyword, specs[parts[-1]])
+
+    return functions
+
+
+@lru_cache(maxsize=None)
+def _python_keywords() -> Dict[str, Tuple]:
+    """
+    Get the Babel keywords: its default ones and the functions listed in
+    `pybabel_config.cfg` renamed by ``_rename_python_functions``.
+    """
+    keywords = dict(DEFAULT_KEYWORDS)
+    keywords.update(_python_functions().values())
+    return keywords
+
+
+def _rename_python_functions(source: str) -> str:
+    """
+    Rename the calls to the functions of `pybabel_config.cfg` as their keyword.
+
+    Babel matches bare function names; renaming the whole dotted names keeps
+    calls like ``self.__(...)`` or ``_p(...)`` out of the catalogs. Lines are
+    preserved for the messages locations.
+    """
+    functions = _python_functions()
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(source).readline))
+    except (tokenize.TokenError, SyntaxError):
+        return source
+
+    replacements = []
+    for index, token in enumerate(tokens):
+        if token.type != tokenize.NAME or (
+            index > 0 and tokens[index - 1].string == "."
+        ):
+            continue
+        for parts, (keyword, _) in functions.items():
+            end = index + 2 * len(parts) - 1
+            callee = tokens[index:end]
+            if (
+                end < len(tokens)
+                and tokens[end].string == "("
+                and tuple(t.string for t in callee[::2]) == parts
+                and all(t.string == "." for t in callee[1::2])
+                and callee[0].start[0] == callee[-1].end[0]
+            ):
+                replacements.append((callee[0].start, callee[-1].end[1], keyword))
+                break
+
+    lines = source.splitlines(keepends=True)
+    for (row, start), end, keyword in reversed(replacements):
+        line = lines[row - 1]
+        lines[row - 1] = line[:start] + keyword + line[end:]
+    return "".join(lines)
+
+
+def _extract_python(
+    fileobj: BinaryIO, keywords: Dict, comment_tags: Tuple, options: Dict
+) -> Iterator[Tuple]:
+    """Babel extraction method for the dotted functions of `pybabel_config.cfg`."""
+    content = fileobj.read()
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(content).readline)
+    try:
+        source = _rename_python_functions(content.decode(encoding))
+    except UnicodeDecodeError:
+        source = None
+    if source is not None:
+        content = source.encode(encoding)
+    return extract_python(io.BytesIO(content), keywords, comment_tags, options)
+
+
+def _extract_python_file(path: Union[str, Path]) -> List[Tuple]:
+    return extract_from_file(_extract_python, path, keywords=_python_keywords())
+
+
+def _extract_python_messages(
+    files: List[Path], jobs: Optional[int] = None
+) -> List[List[Tuple]]:
+    """
+    Extract the messages of Python files with Babel.
+
+    Args:
+        files: Python files
+        jobs: Number of worker processes; default to the number of CPUs
+    Returns
+        Babel messages ``(lineno, message, comments, context)`` of each file
+    """
+    return map_files(_extract_python_file, files, jobs)
+
+
 def extract_strings(
-    input_paths: List[Path], output_path: Union[str, Path], project: str, version: str
+    input_paths: List[Path],
+    output_path: Union[str, Path],
+    project: str,
+    version: str,
+    cwd: Optional[Union[str, Path]] = None,
 ) -> Path:
     """
     Extract localizable strings on input files.
 
     Args:
-        input_paths: List of input folders
+        input_paths: List of input files or folders
         output_path: Output folder relative to the current one
         project: Project name
         version: Version
+        cwd: Folder the input paths are relative to; default to the current one
 
     Returns
         Output path
     """
-    mapping = HERE / "pybabel_config.cfg"
-    cmd = [
-        "pybabel",
-        "extract",
-        "--no-wrap",
-        "--charset=utf-8",
-        "-o",
-        str(output_path),
-        f"--project={project}",
-        f"--version={version}",
-        f"--mapping={mapping!s}",
-    ] + list(str(i) for i in input_paths)
+    cwd = Path.cwd() if cwd is None else Path(cwd)
+    files = []
+    for input_path in map(Path, input_paths):
+        if (cwd / input_path).is_dir():
+            files.extend(
+                f.relative_to(cwd) if not input_path.is_absolute() else f
+                for f in sorted((cwd / input_path).rglob("*.py"))
+            )
+        elif input_path.suffix == ".py":
+            files.append(input_path)
+
+    catalog = Catalog(project=project, version=version, charset="utf-8")
+    messages = _extract_python_messages([cwd / f for f in files])
+    for path, file_messages in zip(files, messages):
+        for lineno, message, comments, context in file_messages:
+            catalog.add(
+                message,
+                None,
+                [(path.as_posix(), lineno)],
+                auto_comments=comments,
+                context=context,
+            )
 
-    subprocess.check_call(cmd)
+    with open(output_path, "wb") as f:
+        write_po(f, catalog, width=0)
 
     return Path.cwd() / output_path
 
 
+def _join_occurrences(occurrences: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    # polib splits occurrences on whitespaces; glue back paths containing spaces
+    joined = []
+    fpaths = []
+    for (fpath, line) in occurrences:
+        fpaths.append(fpath)
+        if line != "":
+            joined.append((" ".join(fpaths), line))
+            fpaths.clear()
+
+    return joined
+
+
+def _group_by_file(
+    entries: List[Dict], files: List[Path], root: Path
+) -> Dict[Path, List[Dict]]:
+    # Split entries per file using their occurrences paths relative to `root`
+    paths = {f.relative_to(root).as_posix(): f for f in files}
+
+    grouped = OrderedDict()
+    for entry in entries:
+        per_file = OrderedDict()
+        for fpath, line in _join_occurrences(entry["occurrences"]):
+            # Babel wraps paths containing spaces in Unicode isolation marks
+            fpath = fpath.strip("\u2068\u2069").replace("\\", "/")
+            f = paths.get(fpath)
+            if f is not None:
+                per_file.setdefault(f, []).append((fpath, line))
+
+        for f, occurrences in per_file.items():
+            grouped.setdefault(f, []).append(dict(entry, occurrences=occurrences))
+
+    return grouped
+
+
+def _files_with_shared_details(grouped: Dict[Path, List[Dict]]) -> List[Path]:
+    # Files of the merged entries found in several files with comments, flags
+    # or a plural; these details cannot be split per file
+    files = {}
+    for f, entries in grouped.items():
+        for entry in entries:
+            key = (entry.get("msgctxt"), entry["msgid"])
+            files.setdefault(key, []).append((f, entry))
+
+    shared = set()
+    for key_files in files.values():
+        if len(key_files) > 1 and any(
+            entry.get(field)
+            for _, entry in key_files
+            for field in ("comment", "tcomment", "flags", "msgid_plural")
+        ):
+            shared.update(f for f, _ in key_files)
+    return [f for f in grouped if f in shared]
+
+
+def _merge_entries(entries: List[Dict]) -> List[Dict]:
+    # Merge entries sharing context and singular like extractors do
+    merged = OrderedDict()
+    seen = {}
+    for entry in entries:
+        key = (entry.get("msgctxt"), entry["msgid"])
+        if key not in merged:
+            merged[key] = dict(entry, occurrences=list(entry["occurrences"]))
+            seen[key] = set(merged[key]["occurrences"])
+            continue
+
+        target = merged[key]
+        if entry.get("msgid_plural") and not target.get("msgid_plural"):
+            target["msgid_plural"] = entry["msgid_plural"]
+            target["msgstr_plural"] = entry["msgstr_plural"]
+        for occurrence in entry["occurrences"]:
+            if occurrence not in seen[key]:
+                seen[key].add(occurrence)
+                target["occurrences"].append(occurrence)
+        for field in ("comment", "tcomment"):
+            if entry.get(field):
+                lines = target.get(field, "").splitlines()
+                lines.extend(
+                    line for line in entry[field].splitlines() if line not in lines
+                )
+                target[field] = "\n".join(lines)
+        for flag in entry.get("flags", []):
+            if flag not in target.setdefault("flags", []):
+                target["flags"].append(flag)
+
+    return list(merged.values())
+
+
+def _extraction_config_key() -> str:
+    # Fingerprint of everything influencing the extracted entries but the files
+    from . import __version__
+
+    config = {
+        "version": __version__,
+        "babel": babel.__version__,
+        "gettext": GETTEXT_CONFIG["js"],
+        "pybabel": (HERE / "pybabel_config.cfg").read_text(),
+        "python_keywords": _python_keywords(),
+        "schema": DEFAULT_SCHEMA_SELECTORS,
+    }
+    data = json.dumps(config, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _extract_python_entries(
+    paths: RelativePaths, files: List[Path], jobs: Optional[int] = None
+) -> Dict[Path, List[Dict]]:
+    entries = OrderedDict()
+    for path, messages in zip(files, _extract_python_messages(files, jobs)):
+        # Occurrences are relative to the repository root to be cacheable
+        fpath = paths(path)
+        entries[path] = []
+        for lineno, message, comments, context in messages:
+            if isinstance(message, (list, tuple)):
+                msgid, msgid_plural = message[:2]
+            else:
+                msgid, msgid_plural = message, None
+
+            data = {"msgid": msgid, "occurrences": [(fpath, str(lineno))]}
+            if msgid_plural:
+                data["msgid_plural"] = msgid_plural
+                data["msgstr_plural"] = {0: "", 1: ""}
+            if context:
+                data["msgctxt"] = context
+            if comments:
+                data["comment"] = "\n".join(comments)
+            flags = sorted(Message(message, context=context).flags)
+            if flags:
+                data["flags"] = flags
+
+            entries[path].append(data)
+
+    return entries
+
+
+def _extract_tsx_entries(
+    repo_root_dir: Path,
+    files: List[Path],
+    all_files: List[Path],
+    jobs: Optional[int] = None,
+    engine: str = "node",
+) -> Dict[Path, List[Dict]]:
+    if engine == "python":
+        extract = partial(tsx_extract.extract_file, root=repo_root_dir)
+        return OrderedDict(zip(files, map_files(extract, files, jobs)))
+
+    jobs = min(get_jobs(jobs), len(files) // MIN_FILES_PER_WORKER)
+    if jobs <= 1:
+        entries = extract_tsx_strings(
+            repo_root_dir, None if len(files) == len(all_files) else files
+        )
+    else:
+        # Each gettext-extract process handles a slice of the packages
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            entries = list(
+                chain.from_iterable(
+                    executor.map(
+                        partial(extract_tsx_strings, repo_root_dir),
+                        split_files(files, jobs),
+                    )
+                )
+            )
+    grouped = _group_by_file(entries, files, repo_root_dir)
+    # Cache the own details of each file to merge them again with the cached
+    # entries of the other files
+    for f in _files_with_shared_details(grouped):
+        grouped[f] = _group_by_file(
+            extract_tsx_strings(repo_root_dir, [f]), [f], repo_root_dir
+        ).get(f, [])
+    return grouped
+
+
+def _extract_schema_entries(
+    repo_root_dir: Path, files: List[Path], jobs: Optional[int] = None
+) -> Dict[Path, List[Dict]]:
+    extract = partial(extract_schema_file, input_path=repo_root_dir)
+    return OrderedDict(zip(files, map_files(extract, files, jobs)))
+
+
+def _extract_cached(
+    cache: Optional[ExtractionCache],
+    kind: str,
+    files: List[Path],
+    extract: Callable[[List[Path]], Dict[Path, List[Dict]]],
+) -> List[Dict]:
+    """
+    Extract entries from ``files`` reusing cached entries of unchanged files.
+
+    Args:
+        cache: Extraction cache; if None all files are extracted
+        kind: Extractor kind
+        files: Files to extract strings from
+        extract: Function extracting the entries of a list of files
+    Returns
+        Entries ordered as ``files``
+    """
+    per_file = {}
+    stale = list(files)
+    digests = {}
+    if cache is not None:
+        stale = []
+        for f in files:
+            digests[f] = hash_file(f)
+            cached = cache.get(kind, f, digests[f])
+            if cached is None:
+                stale.append(f)
+            else:
+                per_file[f] = cached
+
+    if stale:
+        extracted = extract(stale)
+        for f in stale:
+            per_file[f] = extracted.get(f, [])
+            if cache is not None:
+                cache.set(kind, f, digests[f], per_file[f])
+
+    if cache is not None:
+        cache.prune(kind, files)
+
+    return list(chain.from_iterable(per_file[f] for f in files))
+
+
+def _relocate(fpath: str, path_to_remove: str) -> str:
+    # Convert absolute paths to relative paths
+    fpath = str(Path(fpath).resolve()).replace(path_to_remove, "")
+
+    # Normalize paths
+    return fpath.replace("\\", "/")
+
+
 def fix_location(
     path_to_remove: str,
     pot_path: Union[str, Path],
@@ -469,27 +1178,10 @@ def fix_location(
     pot = polib.pofile(str(pot_path), wrapwidth=100000, check_for_duplicates=False)
 
     for entry in pot:
-        new_occurrences = []
-        string_fpaths = []
-        lines = []
-        for (string_fpath, line) in entry.occurrences:
-            # Convert absolute paths to relative paths
-            string_fpaths.append(Path(string_fpath).resolve())
-            lines.append(line)
-
-            if line != "":
-                string_fpath = " ".join(map(lambda p: str(p), string_fpaths)).replace(
-                    path_to_remove, ""
-                )
-
-                # Normalize paths
-                string_fpath = string_fpath.replace("\\", "/")
-
-                new_occurrences.append((string_fpath, line))
-                string_fpaths.clear()
-                lines.clear()
-
-        entry.occurrences = new_occurrences
+        entry.occurrences = [
+            (_relocate(string_fpath, path_to_remove), line)
+            for (string_fpath, line) in _join_occurrences(entry.occurrences)
+        ]
 
     if append_entries:
         for entry in append_entries:
@@ -500,20 +1192,17 @@ def fix_location(
     return pot.metadata.copy()
 
 
-def remove_duplicates(pot_path: Path, metadata: Dict[str, str]) -> None:
+def _deduplicate_catalog(pot: polib.POFile, metadata: Dict[str, str]) -> polib.POFile:
     """
-    Remove duplicate strings in POT file
+    Remove duplicate strings in a catalog
 
     Args:
-        pot_path: POT file path
+        pot: Catalog
         metadata: POT metadata
+    Returns:
+        New catalog without duplicates sorted by occurrences
     """
-    old_pot_name = pot_path.rename(f"{pot_path!s}.bak")
-
-    pot = polib.pofile(str(old_pot_name), wrapwidth=100000, check_for_duplicates=False)
-
     entries = {}
-    entries_data = {}
     duplicates = set()
 
     for entry in pot:
@@ -523,31 +1212,24 @@ def remove_duplicates(pot_path: Path, metadata: Dict[str, str]) -> None:
 
         # Create a unique key using context, singular and plurals
         key = (entry.msgctxt, entry.msgid, entry.msgid_plural)
-        if key in entries:
-            entries[key].append(entry)
-            duplicates.add(key)
+        first = entries.get(key)
+        if first is None:
+            entries[key] = entry
+        elif key in duplicates:
+            first.occurrences.extend(entry.occurrences)
         else:
-            entry.occurrences = list(sorted(entry.occurrences))
-            entries[key] = [entry]
-            entries_data[key] = entry
+            # Merged duplicates only keep their strings and occurrences
+            entries[key] = polib.POEntry(
+                msgid=first.msgid,
+                msgid_plural=first.msgid_plural,
+                msgctxt=first.msgctxt,
+                occurrences=first.occurrences + entry.occurrences,
+            )
+            duplicates.add(key)
 
-    # Merge info from duplicate
     print("Merging duplicates...")
-    for key in duplicates:
-        items = entries[key]
-        entry = entries_data[key]
-        new_occurences = []
-        for item in items:
-            new_occurences.extend(item.occurrences)
-
-        entry = polib.POEntry(
-            msgid=entry.msgid,
-            msgid_plural=entry.msgid_plural,
-            msgctxt=entry.msgctxt,
-            occurrences=list(sorted(new_occurences)),
-        )
-
-        entries[key] = [entry]
+    for entry in entries.values():
+        entry.occurrences = sorted(entry.occurrences)
 
     po = polib.POFile(wrapwidth=100000)
     keys = [
@@ -561,14 +1243,165 @@ def remove_duplicates(pot_path: Path, metadata: Dict[str, str]) -> None:
         new_metadata[key] = metadata[key]
 
     po.metadata = new_metadata
-    for item in sorted(entries, key=lambda x: entries[x][0].occurrences):
-        po.append(entries[item][0])
+    for entry in sorted(entries.values(), key=attrgetter("occurrences")):
+        po.append(entry)
 
-    po.save(str(pot_path))
+    return po
 
-    pot_path.write_text(pot_path.read_text())
 
-    old_pot_name.unlink()
+def remove_duplicates(pot_path: Path, metadata: Dict[str, str]) -> None:
+    """
+    Remove duplicate strings in POT file
+
+    Args:
+        pot_path: POT file path
+        metadata: POT metadata
+    """
+    pot = polib.pofile(str(pot_path), wrapwidth=100000, check_for_duplicates=False)
+    _deduplicate_catalog(pot, metadata).save(str(pot_path))
+
+
+def _msgid_sort_key(entry: Dict) -> Tuple:
+    # Order of `xgettext --sort-output`: singular, then no context first
+    msgctxt = entry.get("msgctxt")
+    return (
+        entry["msgid"],
+        msgctxt is not None,
+        msgctxt or "",
+        entry.get("msgid_plural") or "",
+    )
+
+
+def _merge_catalogs(orig_path: Path, pot: polib.POFile) -> polib.POFile:
+    """
+    Merge a catalog with an existing POT file like ``xgettext -s`` does.
+
+    Entries sharing context, singular and plural are merged; the occurrences,
+    comments and flags of the existing entry come first. Obsolete entries are
+    dropped and the result is sorted by singular and context.
+
+    Args:
+        orig_path: Existing POT file
+        pot: New catalog
+    Returns:
+        Merged catalog with the metadata of the new catalog
+    """
+    orig = polib.pofile(str(orig_path), wrapwidth=100000, check_for_duplicates=False)
+
+    entries = []
+    for entry in chain(orig, pot):
+        if entry.obsolete or not entry.msgid:
+            continue
+        data = _entry_to_dict(entry)
+        data["occurrences"] = _join_occurrences(entry.occurrences)
+        entries.append(data)
+
+    merged = polib.POFile(wrapwidth=100000, check_for_duplicates=False)
+    merged.metadata = pot.metadata.copy()
+    for data in sorted(_merge_entries(entries), key=_msgid_sort_key):
+        merged.append(polib.POEntry(**data))
+
+    return merged
+
+
+def _build_catalog(
+    repo_root_dir: Union[str, Path],
+    project: str,
+    version: str,
+    merge_path: Optional[Path] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+    jobs: Optional[int] = None,
+    use_git: bool = False,
+    engine: str = "node",
+) -> Tuple[polib.POFile, Dict[str, str]]:
+    """
+    Extract the strings of a repository in an in-memory catalog.
+
+    The Python, TS(X) and schema entries are gathered in a single catalog,
+    optionally merged with an existing POT file, without intermediate files.
+
+    Args:
+        repo_root_dir: Repository to extract translation from
+        project: project name
+        version: version
+        merge_path: Existing POT file to merge with, if it exists
+        cache_dir: Folder of the extraction cache; if None, the cache is disabled
+        jobs: Number of parallel extraction jobs; default to the number of CPUs
+        use_git: List the Python files known to git if the repository is a git
+            checkout
+        engine: TS(X) strings extractor; one of ``TSX_ENGINES``
+    Returns:
+        Tuple (catalog, POT metadata)
+    """
+    if engine not in TSX_ENGINES:
+        raise ValueError(f"Unknown TS(X) extraction engine '{engine}'.")
+
+    # Resolve each file once for the cache keys and the occurrences
+    paths = RelativePaths(repo_root_dir)
+    cache = None
+    if cache_dir is not None:
+        cache = ExtractionCache(
+            cache_dir, repo_root_dir, _extraction_config_key(), paths
+        )
+
+    nested_files = find_packages_source_files(repo_root_dir, use_git)
+    flat_files = list(chain(*nested_files.values()))
+    python_files = [f for f in flat_files if f.suffix == ".py"]
+    python_entries = _extract_cached(
+        cache,
+        "python",
+        python_files,
+        partial(_extract_python_entries, paths, jobs=jobs),
+    )
+
+    metadata = {
+        # Same default as Babel catalogs
+        "Project-Id-Version": f"{project} {version or 'VERSION'}",
+        "MIME-Version": "1.0",
+        "Content-Type": "text/plain; charset=utf-8",
+        "Content-Transfer-Encoding": "8bit",
+    }
+    pot = polib.POFile(wrapwidth=100000, check_for_duplicates=False)
+    pot.metadata = metadata.copy()
+    for entry in _merge_entries(python_entries):
+        # Python occurrences are rooted at the repository folder
+        entry["occurrences"] = [
+            ("/" + fpath, line) for fpath, line in entry["occurrences"]
+        ]
+        pot.append(polib.POEntry(**entry))
+
+    tsx_files = find_tsx_files(repo_root_dir)
+    tsx_entries = _extract_cached(
+        cache,
+        # Engines may differ in corner cases; do not mix their entries
+        "tsx" if engine == "node" else f"tsx-{engine}",
+        tsx_files,
+        partial(
+            _extract_tsx_entries,
+            Path(repo_root_dir),
+            all_files=tsx_files,
+            jobs=jobs,
+            engine=engine,
+        ),
+    )
+    schema_entries = _extract_cached(
+        cache,
+        "schema",
+        find_schema_files(repo_root_dir, cache),
+        partial(_extract_schema_entries, Path(repo_root_dir), jobs=jobs),
+    )
+    if cache is not None:
+        cache.save()
+
+    append_entries = _merge_entries(tsx_entries) + schema_entries
+    print("\nTotal entries: {}\n".format(len(append_entries)))
+    for entry in append_entries:
+        pot.append(polib.POEntry(**entry))
+
+    if merge_path is not None and merge_path.exists():
+        pot = _merge_catalogs(merge_path, pot)
+
+    return pot, metadata
 
 
 def create_catalog(
@@ -577,6 +1410,10 @@ def create_catalog(
     project: str,
     version: str,
     merge: bool = True,
+    cache_dir: Optional[Union[str, Path]] = None,
+    jobs: Optional[int] = None,
+    use_git: bool = False,
+    engine: str = "node",
 ) -> Tuple[Path, Dict[str, str]]:
     """
     Create a catalog
@@ -587,36 +1424,26 @@ def create_catalog(
         project: project name
         version: version
         merge: Merge with existing POT file
+        cache_dir: Folder of the extraction cache; if None, the cache is disabled
+        jobs: Number of parallel extraction jobs; default to the number of CPUs
+        use_git: List the Python files known to git if the repository is a git
+            checkout
+        engine: TS(X) strings extractor; one of ``TSX_ENGINES``
     Returns:
         Tuple (POT file path, POT metadata)
     """
     pot_path = Path(locale_dir) / f"{project}.pot"
-    with tempfile.TemporaryDirectory() as tmp:
-        tmp_path = Path(tmp)
-        tmp_pot = tmp_path / f"{project}.pot"
-        nested_files = find_packages_source_files(repo_root_dir)
-        flat_files = list(chain(*nested_files.values()))
-        extract_strings(flat_files, tmp_pot, project, version=version)
-        append_entries = extract_tsx_strings(repo_root_dir) + extract_schema_strings(
-            repo_root_dir
-        )
-        print("\nTotal entries: {}\n".format(len(append_entries)))
-        metadata = fix_location(str(repo_root_dir), tmp_pot, append_entries)
-
-        if merge and pot_path.exists():
-            orig = tmp_path / "orig.pot"
-            final_pot = tmp_path / "out.pot"
-            shutil.copyfile(pot_path, orig)
-
-            # Merge with existing
-            subprocess.check_call(
-                ["xgettext", str(orig), str(tmp_pot), "-s", "-o", str(final_pot)],
-                cwd=tmp,
-            )
-        else:
-            final_pot = tmp_pot
-
-        shutil.copyfile(final_pot, pot_path)
+    pot, metadata = _build_catalog(
+        repo_root_dir,
+        project,
+        version,
+        merge_path=pot_path if merge else None,
+        cache_dir=cache_dir,
+        jobs=jobs,
+        use_git=use_git,
+        engine=engine,
+    )
+    pot.save(str(pot_path))
 
     return pot_path, metadata
 
@@ -656,29 +1483,189 @@ def update_catalogs(
     return po_path
 
 
-def compile_catalog(locale_dir: Path, domain: str, locale: str) -> Path:
+def _update_po_file(
+    template: Tuple[bytes, Catalog],
+    output_dir: Path,
+    locale: str,
+    project: str,
+    version: str,
+    fuzzy_cutoff: Optional[float] = FUZZY_CUTOFF,
+) -> Optional[Path]:
+    # Same as `pybabel init` or `pybabel update` followed by `update_version`
+    if not check_locale(locale):
+        return None
+
+    content, pot = template
+    domain = pot.domain
+    po_path = output_dir / locale / LC_MESSAGES / f"{domain}.po"
+    if po_path.is_file():
+        with open(po_path, "rb") as f:
+            catalog = read_po(f, locale=locale, domain=domain)
+        matched = set()
+        if fuzzy_cutoff is not None:
+            matched = add_fuzzy_matches(catalog, pot, fuzzy_cutoff)
+        catalog.update(pot, no_fuzzy_matching=True)
+        for key in matched:
+            catalog.obsolete.pop(key, None)
+    else:
+        # The plural forms of a new catalog depend on its locale
+        catalog = read_po(io.BytesIO(content), locale=locale, domain=domain)
+        catalog.revision_date = datetime.datetime.now(LOCALTZ)
+        catalog.fuzzy = False
+        po_path.parent.mkdir(parents=True, exist_ok=True)
+
+    buffer = io.BytesIO()
+    write_po(buffer, catalog, width=76)
+    # Keep the layout of the files written by polib
+    po = polib.pofile(buffer.getvalue().decode("utf-8"), wrapwidth=76)
+    po.metadata["Project-Id-Version"] = f"{project} {version}"
+    po.save(str(po_path))
+
+    return po_path
+
+
+def update_locales_catalogs(
+    pot_path: Union[str, Path],
+    output_dir: Union[str, Path],
+    locales: List[str],
+    project: str,
+    version: str,
+    jobs: Optional[int] = None,
+    fuzzy_cutoff: Optional[float] = FUZZY_CUTOFF,
+) -> Dict[str, Path]:
     """
-    Compile `*.po` files into `*.mo` files and saved them next to the
-    original po files found.
+    Create or update the `.po` files of several locales from a `.pot` file.
+
+    The template is parsed once and the locales are updated in parallel. Each
+    `.po` file is read and written once, with its version header set. New
+    messages are fuzzy matched with the previous translations through an index
+    instead of comparing them all.
+
+    Args:
+        pot_path: Path to `.pot` file
+        output_dir: Path to base output directory. The `.po` files will be placed in
+            "{output_dir}/{locale}/LC_MESSAGES/{domain}.po".
+            Domain will be inferred from the `pot_path`.
+        locales: Locales
+        project: Project name
+        version: Project version
+        jobs: Number of worker processes; default to the number of CPUs
+        fuzzy_cutoff: Minimal similarity ratio of a fuzzy match; if None, the
+            fuzzy matching is disabled
+    Returns:
+        Mapping (locale, `.po` file) of the valid locales
+    """
+    content = Path(pot_path).read_bytes()
+    template = (content, read_po(io.BytesIO(content), domain=Path(pot_path).stem))
+
+    update = partial(
+        _update_po_file,
+        template,
+        Path(output_dir),
+        project=project,
+        version=version,
+        fuzzy_cutoff=fuzzy_cutoff,
+    )
+    jobs = min(get_jobs(jobs), len(locales))
+    if jobs <= 1:
+        po_paths = list(map(update, locales))
+    else:
+        # Ship the template once per worker
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunksize = -(-len(locales) // jobs)
+            po_paths = list(executor.map(update, locales, chunksize=chunksize))
+
+    return {
+        locale: po_path
+        for locale, po_path in zip(locales, po_paths)
+        if po_path is not None
+    }
+
+
+def language_pack_messages_dir(language_packs_dir: Path, locale: str) -> Path:
+    """
+    Get the messages folder of a locale language pack.
+
+    The language pack is created if it does not exist.
+
+    Args:
+        language_packs_dir: Folder containing the language packs
+        locale: locale
+    Returns:
+        The `LC_MESSAGES` folder of the language pack
+    """
+    pkg_name = f"jupyterlab-language-pack-{locale}".replace("_", "-")
+    locale_language_pack_dir = (
+        language_packs_dir / pkg_name / pkg_name.replace("-", "_")
+    )
+
+    # Check if it exists, otherwise create it
+    if not locale_language_pack_dir.is_dir():
+        create_new_language_pack(language_packs_dir, locale)
+
+    return (
+        locale_language_pack_dir
+        / LOCALE_FOLDER
+        / locale.replace("-", "_")
+        / LC_MESSAGES
+    )
+
+
+def compile_catalog(
+    locale_dir: Path,
+    domain: str,
+    locale: str,
+    language_packs_dir: Optional[Path] = None,
+    incremental: bool = False,
+    json_format: str = "pretty",
+) -> Path:
+    """
+    Compile `*.po` files into `*.mo` and `*.json` files and saved them next
+    to the original po files found.
+
+    Translations are validated as `pybabel compile` does. The manifest of
+    the locale bundles is updated if the catalog was compiled.
 
     Args:
         locale_dir: Catalog output director
         domain: Catalog domain
         locale: locale
+        language_packs_dir: If set, save the compiled files in the locale
+            language pack of this folder instead, replacing existing ones
+        incremental: Whether to skip the catalog if it did not change since
+            the last incremental compilation
+        json_format: Bundle layout; one of ``JSON_FORMATS``
     Returns:
         Compile catalog file
+    Raises:
+        ValueError: if some translations are invalid.
     """
-    # Check if locale exists!
-    cmd = [
-        "pybabel",
-        "compile",
-        f"--domain={domain}",
-        f"--dir={locale_dir!s}",
-        f"--locale={locale}",
-    ]
-    subprocess.check_call(cmd)
+    po_path = locale_dir / locale / LC_MESSAGES / f"{domain}.po"
+    output_dir = po_path.parent
+    if language_packs_dir is None:
+        _, _, compiled = compile_catalog_file(
+            po_path,
+            domain,
+            check=True,
+            incremental=incremental,
+            json_format=json_format,
+        )
+    else:
+        output_dir = language_pack_messages_dir(language_packs_dir, locale)
+        _, _, compiled = compile_catalog_file(
+            po_path,
+            domain,
+            output_dir,
+            check=True,
+            merge=False,
+            incremental=incremental,
+            json_format=json_format,
+        )
+    # Skipped catalogs do not change the hashes of the bundles
+    if compiled or not (output_dir.parent / BUNDLES_MANIFEST).is_file():
+        write_bundles_manifest(output_dir.parent)
 
-    return locale_dir / locale / LC_MESSAGES / f"{domain}.po"
+    return po_path
 
 
 def compile_to_mo(po_path: Path) -> Path:
@@ -702,6 +1689,10 @@ def extract_translations(
     output_dir: Union[str, Path],
     project: str,
     merge: bool = True,
+    cache_dir: Optional[Union[str, Path]] = None,
+    jobs: Optional[int] = None,
+    engine: str = "node",
+    use_git: bool = False,
 ) -> Path:
     """
     Extract translations from a package folder
@@ -710,6 +1701,12 @@ def extract_translations(
         repo_root_dir: package folder to extract translation from
         output_dir: output folder
         project: project name
+        merge: Merge with existing POT file
+        cache_dir: Folder of the extraction cache; if None, the cache is disabled
+        jobs: Number of parallel extraction jobs; default to the number of CPUs
+        engine: TS(X) strings extractor; one of ``TSX_ENGINES``
+        use_git: List the Python files known to git if the package folder is
+            a git checkout
     Returns:
         Generated POT file path
     """
@@ -720,15 +1717,34 @@ def extract_translations(
     locale_dir = Path(output_dir) / LOCALE_FOLDER
     locale_dir.mkdir(parents=True, exist_ok=True)
 
-    pot_path, metadata = create_catalog(
-        repo_root_dir, locale_dir, project, version, merge
+    pot_path = locale_dir / f"{project}.pot"
+    pot, metadata = _build_catalog(
+        repo_root_dir,
+        project,
+        version,
+        merge_path=pot_path if merge else None,
+        cache_dir=cache_dir,
+        jobs=jobs,
+        engine=engine,
+        use_git=use_git,
     )
-    remove_duplicates(pot_path, metadata)
+    # Serialize the catalog once
+    _deduplicate_catalog(pot, metadata).save(str(pot_path))
 
     return pot_path
 
 
-def update_translations(repo_root_dir, output_dir, project, locales=None):
+def update_translations(
+    repo_root_dir,
+    output_dir,
+    project,
+    locales=None,
+    cache_dir=None,
+    jobs=None,
+    engine="node",
+    fuzzy_cutoff=FUZZY_CUTOFF,
+    use_git=False,
+):
     """
     FIXME:
 
@@ -742,6 +1758,16 @@ def update_translations(repo_root_dir, output_dir, project, locales=None):
         FIXME:
     locales: sequence
         FIXME:
+    cache_dir: str or Path, optional
+        Folder of the extraction cache; if None, the cache is disabled.
+    jobs: int, optional
+        Number of parallel extraction and update jobs; default to the number of CPUs.
+    engine: str, optional
+        TS(X) strings extractor; one of ``TSX_ENGINES``.
+    fuzzy_cutoff: float, optional
+        Minimal similarity ratio of fuzzy matches; if None, fuzzy matching is disabled.
+    use_git: bool, optional
+        List the Python files known to git if the repository is a git checkout.
     """
     # Find locales, if not there, error?
     locale_dir = output_dir / LOCALE_FOLDER
@@ -753,25 +1779,49 @@ def update_translations(repo_root_dir, output_dir, project, locales=None):
 
     # Extract pot file
     locale_dir.mkdir(parents=True, exist_ok=True)
-    pot_path, metadata = create_catalog(repo_root_dir, locale_dir, project, version)
-    remove_duplicates(pot_path, metadata)
+    pot_path = locale_dir / f"{project}.pot"
+    pot, metadata = _build_catalog(
+        repo_root_dir,
+        project,
+        version,
+        merge_path=pot_path,
+        cache_dir=cache_dir,
+        jobs=jobs,
+        engine=engine,
+        use_git=use_git,
+    )
+    _deduplicate_catalog(pot, metadata).save(str(pot_path))
 
     # Create or update po files
-    for locale in locales:
-        po_path = update_catalogs(pot_path, locale_dir, locale)
-        update_version(po_path, project, version)
+    update_locales_catalogs(
+        pot_path, locale_dir, locales, project, version, jobs, fuzzy_cutoff
+    )
 
 
 def compile_translations(
-    output_dir: Path, project: str, locales: List[str] = None
+    output_dir: Path,
+    project: str,
+    locales: List[str] = None,
+    jobs: Optional[int] = None,
+    language_packs_dir: Optional[Path] = None,
+    incremental: bool = False,
+    json_format: str = "pretty",
 ) -> Dict[str, Path]:
     """
     Compile the translation for the given ``project`` in the provided output directory.
 
+    The locales are compiled in parallel.
+
     Args:
         output_dir: Output directory
         project: Project name
         locales: Locale list
+        jobs: Number of worker processes; default to the number of CPUs
+        language_packs_dir: If set, save the compiled files in the language
+            packs of this folder
+        incremental: Whether to skip the locales whose catalog and compiled
+            files did not change since the last incremental compilation
+        json_format: Bundle layout; one of ``JSON_FORMATS``
     Returns:
         Mapping (locale, catalog file)
     """
@@ -779,11 +1829,22 @@ def compile_translations(
         locales = find_locales(output_dir)
 
     locale_dir = output_dir / LOCALE_FOLDER
-    po_paths = {}
-    for locale in locales:
-        po_paths[locale] = compile_catalog(locale_dir, project, locale)
+    compile_locale = partial(
+        compile_catalog,
+        locale_dir,
+        project,
+        language_packs_dir=language_packs_dir,
+        incremental=incremental,
+        json_format=json_format,
+    )
+    jobs = min(get_jobs(jobs), len(locales))
+    if jobs <= 1:
+        po_paths = list(map(compile_locale, locales))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            po_paths = list(executor.map(compile_locale, locales))
 
-    return po_paths
+    return dict(zip(locales, po_paths))
 
 
 def update_version(
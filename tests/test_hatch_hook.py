@@ -1,3 +1,5 @@
+import hashlib
+import json
 import subprocess
 import sys
 import tarfile
@@ -179,6 +181,7 @@ def test_hatch_build(language_package):
     ) as wheel:
         assert wheel.namelist() == [
             "jupyterlab_language_pack_ko_KR/__init__.py",
+            "jupyterlab_language_pack_ko_KR/locale/ko_KR/bundles-manifest.json",
             "jupyterlab_language_pack_ko_KR/locale/ko_KR/LC_MESSAGES/jupyterlab.json",
             "jupyterlab_language_pack_ko_KR/locale/ko_KR/LC_MESSAGES/jupyterlab.mo",
             "jupyterlab_language_pack_ko_KR/locale/ko_KR/LC_MESSAGES/spellchecker.json",
@@ -188,6 +191,18 @@ def test_hatch_build(language_package):
             "jupyterlab_language_pack_ko_kr-1.0.post2.dist-info/entry_points.txt",
             "jupyterlab_language_pack_ko_kr-1.0.post2.dist-info/RECORD",
         ]
+        manifest = json.loads(
+            wheel.read(
+                "jupyterlab_language_pack_ko_KR/locale/ko_KR/bundles-manifest.json"
+            )
+        )
+        bundle = wheel.read(
+            "jupyterlab_language_pack_ko_KR/locale/ko_KR/LC_MESSAGES/jupyterlab.json"
+        )
+        assert manifest["files"]["LC_MESSAGES/jupyterlab.json"] == {
+            "sha256": hashlib.sha256(bundle).hexdigest(),
+            "size": len(bundle),
+        }
         with wheel.open(
             "jupyterlab_language_pack_ko_KR/locale/ko_KR/LC_MESSAGES/jupyterlab.json"
         ) as myfile:
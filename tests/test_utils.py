@@ -1,15 +1,36 @@
 # Copyright (c) Jupyter Development Team.
 # Distributed under the terms of the Modified BSD License.
+import hashlib
 import json
+import queue
 import shutil
+import struct
 import subprocess
+from difflib import get_close_matches
 from pathlib import Path
 
 import polib
 import pytest
 
+from jupyterlab_translate import converters
+from jupyterlab_translate import finder
+from jupyterlab_translate import gettext_extract
+from jupyterlab_translate import locales
+from jupyterlab_translate import tsx_extract
+from jupyterlab_translate import utils
+from jupyterlab_translate.api import compile_language_pack
+from jupyterlab_translate.cache import ExtractionCache
+from jupyterlab_translate.cache import RelativePaths
+from jupyterlab_translate.constants import GETTEXT_CONFIG
+from jupyterlab_translate.constants import TSX_ENGINES
+from jupyterlab_translate.converters import compile_catalog_file
+from jupyterlab_translate.fuzzy import FuzzyIndex
+from jupyterlab_translate.manifest import write_bundles_manifest
+from jupyterlab_translate.mo import hashpjw
+from jupyterlab_translate.mo import MOCatalog
 from jupyterlab_translate.utils import _extract_schema_strings
 from jupyterlab_translate.utils import create_catalog
+from jupyterlab_translate.utils import find_source_files
 
 
 @pytest.fixture
@@ -49,6 +70,53 @@ def test_create_catalog_with_merge(updated_dummy_pkg):
     ]
 
 
+def test_merge_catalogs(tmp_path):
+    orig = polib.POFile()
+    orig.append(polib.POEntry(msgid="b", occurrences=[("/a.py", "2")]))
+    orig.append(polib.POEntry(msgid="a", msgctxt="z", occurrences=[("/a.py", "1")]))
+    orig.append(polib.POEntry(msgid="old", obsolete=True))
+    orig.save(str(tmp_path / "orig.pot"))
+    new = polib.POFile()
+    new.metadata = {"Project-Id-Version": "dummy 0.1.0"}
+    new.append(polib.POEntry(msgid="b", occurrences=[("/b.py", "1"), ("/a.py", "2")]))
+    new.append(polib.POEntry(msgid="a", occurrences=[("src/my file.ts", "3")]))
+
+    merged = utils._merge_catalogs(tmp_path / "orig.pot", new)
+
+    assert merged.metadata == new.metadata
+    assert [(e.msgctxt, e.msgid, e.occurrences) for e in merged] == [
+        (None, "a", [("src/my file.ts", "3")]),
+        ("z", "a", [("/a.py", "1")]),
+        (None, "b", [("/a.py", "2"), ("/b.py", "1")]),
+    ]
+
+
+def test_remove_duplicates(tmp_path):
+    pot = polib.POFile()
+    pot.append(polib.POEntry(msgid="b", occurrences=[("/b.py", "1")], flags=["x"]))
+    pot.append(polib.POEntry(msgid="a", occurrences=[("/c.py", "2"), ("/a.py", "9")]))
+    pot.append(polib.POEntry(msgid="b", occurrences=[("/a.py", "10")]))
+    pot.append(polib.POEntry(msgid="b", msgctxt="c", occurrences=[("/d.py", "1")]))
+    pot.save(str(tmp_path / "dummy.pot"))
+    metadata = {
+        "Project-Id-Version": "dummy 0.1.0",
+        "MIME-Version": "1.0",
+        "Content-Type": "text/plain; charset=utf-8",
+        "Content-Transfer-Encoding": "8bit",
+        "Language": "fr",
+    }
+
+    utils.remove_duplicates(tmp_path / "dummy.pot", metadata)
+
+    pot = polib.pofile(str(tmp_path / "dummy.pot"))
+    assert "Language" not in pot.metadata
+    assert [(e.msgctxt, e.msgid, e.occurrences, e.flags) for e in pot] == [
+        (None, "b", [("/a.py", "10"), ("/b.py", "1")], []),
+        (None, "a", [("/a.py", "9"), ("/c.py", "2")], []),
+        ("c", "b", [("/d.py", "1")], []),
+    ]
+
+
 def test_create_catalog_without_merge(updated_dummy_pkg):
     pot_file, _ = create_catalog(
         updated_dummy_pkg,
@@ -67,6 +135,377 @@ def test_create_catalog_without_merge(updated_dummy_pkg):
     ]
 
 
+@pytest.mark.parametrize(
+    "version, header", [("0.1.0", "dummy_pkg 0.1.0"), ("", "dummy_pkg VERSION")]
+)
+def test_create_catalog_version(dummy_pkg, version, header):
+    pot_file, _ = create_catalog(
+        dummy_pkg, dummy_pkg / "locale", dummy_pkg.name, version, False
+    )
+    pot = polib.pofile(str(pot_file), wrapwidth=100000, check_for_duplicates=False)
+
+    assert pot.metadata["Project-Id-Version"] == header
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_update_locales_catalogs(tmp_path, jobs):
+    pot = polib.POFile()
+    pot.metadata = {"Project-Id-Version": "dummy 0.1.0"}
+    pot.append(polib.POEntry(msgid="Open file", occurrences=[("/a.py", "1")]))
+    pot.append(polib.POEntry(msgid="Close", msgid_plural="Close all"))
+    pot.save(str(tmp_path / "dummy.pot"))
+    fr_po = tmp_path / "fr_FR" / "LC_MESSAGES" / "dummy.po"
+    fr_po.parent.mkdir(parents=True)
+    fr_po.write_text(
+        'msgid ""\nmsgstr ""\n"Project-Id-Version: dummy 0.0.1\\n"\n\n'
+        'msgid "Open files"\nmsgstr "Ouvrir des fichiers"\n'
+    )
+
+    po_paths = utils.update_locales_catalogs(
+        tmp_path / "dummy.pot",
+        tmp_path,
+        ["fr_FR", "pl_PL", "xx_XX"],
+        "dummy",
+        "0.2.0",
+        jobs,
+    )
+
+    assert po_paths == {
+        "fr_FR": fr_po,
+        "pl_PL": tmp_path / "pl_PL" / "LC_MESSAGES" / "dummy.po",
+    }
+    fr = polib.pofile(str(fr_po))
+    assert fr.metadata["Project-Id-Version"] == "dummy 0.2.0"
+    assert fr.find("Open file").msgstr == "Ouvrir des fichiers"
+    assert "fuzzy" in fr.find("Open file").flags
+    pl = polib.pofile(str(po_paths["pl_PL"]))
+    assert pl.metadata["Project-Id-Version"] == "dummy 0.2.0"
+    assert len(pl.find("Close").msgstr_plural) == 3
+
+
+def test_compile_catalog_file(tmp_path):
+    po = polib.POFile()
+    po.metadata = {
+        "Project-Id-Version": "dummy 0.1.0",
+        "Language": "fr_FR",
+        "Plural-Forms": "nplurals=2; plural=(n > 1);",
+        "Content-Type": "text/plain; charset=UTF-8",
+    }
+    po.append(polib.POEntry(msgid="Open", msgstr="Ouvrir"))
+    po.append(polib.POEntry(msgid="Close", msgctxt="menu", msgstr="Fermer"))
+    po.append(
+        polib.POEntry(
+            msgid="File", msgid_plural="Files", msgstr_plural={0: "Fichier", 1: ""}
+        )
+    )
+    po_path = tmp_path / "dummy.po"
+    po.save(str(po_path))
+
+    mo_path, json_path, compiled = compile_catalog_file(po_path, "dummy", check=True)
+    assert compiled
+
+    assert mo_path == tmp_path / "dummy.mo"
+    assert polib.mofile(str(mo_path)).find("Open").msgstr == "Ouvrir"
+    assert json.loads(json_path.read_text()) == {
+        "": {
+            "domain": "dummy",
+            "version": "0.1.0",
+            "language": "fr-FR",
+            "plural_forms": "nplurals=2; plural=(n > 1);",
+        },
+        "Open": ["Ouvrir"],
+        "menu\x04Close": ["Fermer"],
+        "File": ["Fichier", ""],
+    }
+
+    po.append(polib.POEntry(msgid="%(count)s files", msgstr="%(nombre)s fichiers"))
+    po.save(str(po_path))
+    with pytest.raises(ValueError, match="unknown named placeholder"):
+        compile_catalog_file(po_path, "dummy", check=True)
+
+
+def test_write_jed_formats(tmp_path):
+    data = {"": {"domain": "dummy"}, "b": ["é"], "a": ["x", ""]}
+
+    converters.write_jed(tmp_path / "pretty.json", data)
+    converters.write_jed(tmp_path / "compact.json", data, json_format="compact")
+
+    assert (tmp_path / "pretty.json").read_text() == json.dumps(
+        data, sort_keys=True, indent=4
+    )
+    assert (
+        tmp_path / "compact.json"
+    ).read_text() == '{"":{"domain":"dummy"},"a":["x",""],"b":["\\u00e9"]}'
+    with pytest.raises(ValueError):
+        converters.write_jed(tmp_path / "other.json", data, json_format="other")
+
+
+def test_compile_catalog_file_incremental(tmp_path, monkeypatch):
+    po = polib.POFile()
+    po.metadata = {
+        "Project-Id-Version": "dummy 0.1.0",
+        "Language": "fr_FR",
+        "Plural-Forms": "nplurals=2; plural=(n > 1);",
+    }
+    po.append(polib.POEntry(msgid="Open", msgstr="Ouvrir"))
+    po_path = tmp_path / "dummy.po"
+    po.save(str(po_path))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    mo_path, json_path, _ = compile_catalog_file(po_path, "dummy", incremental=True)
+    # The build state stays out of the outputs folder
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "cache",
+        "dummy.json",
+        "dummy.mo",
+        "dummy.po",
+    ]
+    assert len(list((tmp_path / "cache").rglob("*-dummy.json"))) == 1
+
+    parsed = []
+    read_catalog = converters.read_catalog
+    monkeypatch.setattr(
+        converters, "read_catalog", lambda p: parsed.append(p) or read_catalog(p)
+    )
+
+    assert not compile_catalog_file(po_path, "dummy", incremental=True)[2]
+    assert parsed == []
+
+    # Changed options, outputs or inputs are compiled again
+    compile_catalog_file(po_path, "dummy", incremental=True, merge=False)
+    assert len(parsed) == 1
+    json_path.write_text("{}")
+    compile_catalog_file(po_path, "dummy", incremental=True, merge=False)
+    assert len(parsed) == 2
+    assert json.loads(json_path.read_text())["Open"] == ["Ouvrir"]
+    po.append(polib.POEntry(msgid="Close", msgstr="Fermer"))
+    po.save(str(po_path))
+    compile_catalog_file(po_path, "dummy", incremental=True, merge=False)
+    assert len(parsed) == 3
+    assert polib.mofile(str(mo_path)).find("Close").msgstr == "Fermer"
+
+
+def test_hook_compile_po_file(tmp_path):
+    from jupyterlab_translate import plugin
+
+    po = polib.POFile()
+    po.metadata = {
+        "Project-Id-Version": "dummy 0.1.0",
+        "Language": "fr_FR",
+        "Plural-Forms": "nplurals=2; plural=(n > 1);",
+    }
+    po.append(polib.POEntry(msgid="Open", msgstr="Ouvrir"))
+    messages_dir = tmp_path / "fr_FR" / "LC_MESSAGES"
+    messages_dir.mkdir(parents=True)
+    po_path = messages_dir / "dummy.po"
+    po.save(str(po_path))
+
+    assert plugin._compile_po_file(po_path, "compact") == 100
+    json_path = po_path.with_suffix(".json")
+    assert converters.json_format_of(json_path) == "compact"
+    # Outputs missing from the bundles manifest are compiled again
+    assert plugin._compile_po_file(po_path, "compact") == 100
+    write_bundles_manifest(tmp_path / "fr_FR")
+    assert plugin._compile_po_file(po_path, "compact") is None
+
+    # Changed layout or outputs are compiled again
+    assert plugin._compile_po_file(po_path, "pretty") == 100
+    assert converters.json_format_of(json_path) == "pretty"
+    write_bundles_manifest(tmp_path / "fr_FR")
+    assert plugin._compile_po_file(po_path, "pretty") is None
+    json_path.write_text("{}")
+    assert plugin._compile_po_file(po_path, "pretty") == 100
+    assert json.loads(json_path.read_text())["Open"] == ["Ouvrir"]
+
+
+def test_compile_catalog_incremental_manifest(tmp_path, monkeypatch):
+    po = polib.POFile()
+    po.metadata = {
+        "Project-Id-Version": "dummy 0.1.0",
+        "Language": "fr_FR",
+        "Plural-Forms": "nplurals=2; plural=(n > 1);",
+    }
+    po.append(polib.POEntry(msgid="Open", msgstr="Ouvrir"))
+    messages_dir = tmp_path / "locale" / "fr_FR" / "LC_MESSAGES"
+    messages_dir.mkdir(parents=True)
+    po.save(str(messages_dir / "dummy.po"))
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+    written = []
+    write_manifest = utils.write_bundles_manifest
+    monkeypatch.setattr(
+        utils,
+        "write_bundles_manifest",
+        lambda p: written.append(p) or write_manifest(p),
+    )
+    for _ in range(2):
+        utils.compile_catalog(tmp_path / "locale", "dummy", "fr_FR", incremental=True)
+
+    # Skipped catalogs do not hash the bundles again
+    assert written == [tmp_path / "locale" / "fr_FR"]
+
+
+def _add_mo_hash_table(content: bytes, size: int) -> bytes:
+    # polib does not write the hash table of msgfmt
+    count, originals = struct.unpack_from("<2I", content, 8)
+    table = [0] * size
+    for index in range(count):
+        length, offset = struct.unpack_from("<2I", content, originals + 8 * index)
+        value = hashpjw(content[offset : offset + length].split(b"\0")[0])
+        slot = value % size
+        while table[slot]:
+            slot = (slot + 1 + value % (size - 2)) % size
+        table[slot] = index + 1
+    header = struct.pack("<2I", size, len(content))
+    return content[:20] + header + content[28:] + struct.pack(f"<{size}I", *table)
+
+
+@pytest.mark.parametrize("hash_size", [0, 7])
+def test_mo_catalog(tmp_path, hash_size):
+    po = polib.POFile()
+    po.metadata = {
+        "Project-Id-Version": "dummy 0.1.0",
+        "Language": "fr_FR",
+        "Plural-Forms": "nplurals=2; plural=(n > 1);",
+        "Content-Type": "text/plain; charset=UTF-8",
+    }
+    po.append(polib.POEntry(msgid="Open", msgstr="Ouvrir"))
+    po.append(polib.POEntry(msgid="Close", msgctxt="menu", msgstr="Fermer"))
+    po.append(
+        polib.POEntry(
+            msgid="File",
+            msgid_plural="Files",
+            msgstr_plural={0: "Fichier", 1: "Fichiers"},
+        )
+    )
+    po.append(polib.POEntry(msgid="Save", msgstr=""))
+    content = po.to_binary()
+    if hash_size:
+        content = _add_mo_hash_table(content, hash_size)
+    (tmp_path / "dummy.mo").write_bytes(content)
+
+    with MOCatalog(tmp_path / "dummy.mo") as catalog:
+        assert catalog.gettext("Open") == "Ouvrir"
+        assert catalog.gettext("Close") is None
+        assert catalog.gettext("Close", "menu") == "Fermer"
+        assert catalog.ngettext("File", 0) == "Fichier"
+        assert catalog.ngettext("File", 1) == "Fichiers"
+        assert catalog.ngettext("File", 2) is None
+        assert catalog.gettext("Save") is None
+        assert catalog.metadata["Language"] == "fr_FR"
+        assert sorted(catalog.keys()) == ["File", "Open", "menu\x04Close"]
+        assert catalog.to_jed(
+            ["Open", "File", "menu\x04Close", "Missing"], "dummy"
+        ) == converters.catalog_to_jed(po, "dummy")
+
+    # Catalogs are shared until their file changes
+    catalog = finder.get_catalog(tmp_path / "dummy.mo")
+    assert finder.get_catalog(tmp_path / "dummy.mo") is catalog
+    assert catalog.gettext("Open") == "Ouvrir"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_compile_language_pack(tmp_path, jobs):
+    messages = {}
+    for locale in ("fr_FR", "pl_PL"):
+        po = polib.POFile()
+        po.metadata = {
+            "Project-Id-Version": "jupyterlab 4.0.0",
+            "Language": locale,
+            "Plural-Forms": "nplurals=2; plural=(n > 1);",
+        }
+        po.append(polib.POEntry(msgid="Open", msgstr=f"Open {locale}"))
+        po_path = tmp_path / "jupyterlab" / "locale" / locale / "LC_MESSAGES"
+        po_path.mkdir(parents=True)
+        po.save(str(po_path / "jupyterlab.po"))
+
+        pkg_name = f"jupyterlab-language-pack-{locale}".replace("_", "-")
+        messages[locale] = (
+            tmp_path
+            / "language-packs"
+            / pkg_name
+            / pkg_name.replace("-", "_")
+            / "locale"
+            / locale
+            / "LC_MESSAGES"
+        )
+        messages[locale].mkdir(parents=True)
+        (messages[locale] / "jupyterlab.json").write_text('{"": {}, "Old": ["x"]}')
+
+    compile_language_pack(tmp_path, "jupyterlab", ["fr_FR", "pl_PL"], jobs)
+
+    for locale, folder in messages.items():
+        assert sorted(p.name for p in folder.iterdir()) == [
+            "jupyterlab.json",
+            "jupyterlab.mo",
+        ]
+        data = json.loads((folder / "jupyterlab.json").read_text())
+        assert data["Open"] == [f"Open {locale}"]
+        assert "Old" not in data
+    assert not list((tmp_path / "jupyterlab").rglob("*.json"))
+
+
+@pytest.mark.parametrize(
+    "locale, valid",
+    [
+        ("es_ES", True),
+        ("pt-BR", True),
+        ("zh_CN", True),
+        ("ach_UG", True),
+        ("no-NO", True),
+        ("xx_XX", False),
+    ],
+)
+def test_check_locale(locale, valid, monkeypatch):
+    assert locales.check_locale(locale) is valid
+
+    # Results are memoized
+    monkeypatch.setattr(locales, "Locale", None)
+    assert locales.check_locale(locale) is valid
+
+
+def test_fuzzy_index():
+    index = FuzzyIndex(["open a file", "close the tab", "save all files"])
+
+    assert index.match("open the file") == "open a file"
+    assert index.match("save all the files") == "save all files"
+    assert index.match("restart kernel") is None
+    assert FuzzyIndex(["open a file"], cutoff=0.95).match("open the file") is None
+
+    # Long strings are scored as Babel does, with the difflib junk heuristic
+    word = " ".join(["open the selected notebook file in a new tab"] * 6)
+    strings = [
+        word.replace("open", "close", 3),
+        word[:150],
+        " ".join(["open a selected notebook document in the tab"] * 6),
+    ]
+    assert FuzzyIndex(strings).match(word) == get_close_matches(word, strings, 1)[0]
+
+
+def test_extract_python_messages(tmp_path):
+    source = tmp_path / "handler.py"
+    source.write_text(
+        """trans.__("Open")
+trans._p("menu", "Close")
+trans._n(
+    "One file", "{n} files", n
+)
+gettext("Default keyword")
+self.__("private")
+_p("settings", "not a translation")
+self.trans.__("other receiver")
+"""
+    )
+
+    assert utils._extract_python_messages([source]) == [
+        [
+            (1, "Open", [], None),
+            (2, "Close", [], "menu"),
+            (4, ("One file", "{n} files"), [], None),
+            (6, "Default keyword", [], None),
+        ]
+    ]
+
+
 def test_extract_from_settings():
     with open("tests/example.json") as f:
         data = f.read()
@@ -93,3 +532,489 @@ def test_extract_from_settings():
         ("example.json", "/properties/editorConfig/title")
     ]
     assert entries["Text Editor Indentation"]["msgctxt"] == "menu"
+
+
+def test_extract_from_settings_custom_selectors():
+    schema = {
+        "jupyter.lab.internationalization": {
+            "selectors": ["properties/.*/enumLabels/.*", "title"]
+        },
+        "title": "Settings",
+        "properties": {
+            "mode": {
+                "title": "Mode",
+                "enumLabels": {"light": "Light", "dark": "Dark"},
+                "default": "light",
+            }
+        },
+    }
+
+    entries = [
+        (entry["msgctxt"], entry["msgid"], entry["occurrences"][0][1])
+        for entry in _extract_schema_strings(schema, "example.json")
+    ]
+    assert entries == [
+        ("schema", "Settings", "/title"),
+        ("settings", "Mode", "/properties/mode/title"),
+        ("schema", "Light", "/properties/mode/enumLabels/light"),
+        ("schema", "Dark", "/properties/mode/enumLabels/dark"),
+    ]
+
+
+def test_find_schema_files_with_cache(tmp_path, monkeypatch):
+    repo = tmp_path / "repo"
+    for name, manifest in (
+        ("a", {"name": "a", "jupyterlab": {"schemaDir": "schema"}}),
+        ("b", {"name": "b"}),
+    ):
+        (repo / name / "schema").mkdir(parents=True)
+        (repo / name / "package.json").write_text(json.dumps(manifest))
+        (repo / name / "schema" / "plugin.json").write_text("{}")
+
+    cache = ExtractionCache(tmp_path / "cache", repo, "key")
+    expected = [repo / "a" / "schema" / "plugin.json"]
+    assert utils.find_schema_files(repo, cache) == expected
+
+    read = []
+    monkeypatch.setattr(utils, "_read_schema_dir", read.append)
+    assert utils.find_schema_files(repo, cache) == expected
+    assert read == []
+
+
+def test_create_catalog_with_cache(dummy_pkg, tmp_path):
+    cache_dir = tmp_path / "cache"
+    create_catalog(dummy_pkg, dummy_pkg / "locale", dummy_pkg.name, "0.1.0", False)
+    expected = (dummy_pkg / "locale" / "dummy_pkg.pot").read_text()
+
+    for _ in range(2):
+        pot_file, _ = create_catalog(
+            dummy_pkg,
+            dummy_pkg / "locale",
+            dummy_pkg.name,
+            "0.1.0",
+            False,
+            cache_dir=cache_dir,
+        )
+        assert pot_file.read_text() == expected
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+    # Changed files are extracted again
+    source = dummy_pkg / "src" / "documentwidget.ts"
+    source.write_text(source.read_text().replace("Remove the last row", "Remove"))
+    pot_file, _ = create_catalog(
+        dummy_pkg,
+        dummy_pkg / "locale",
+        dummy_pkg.name,
+        "0.1.0",
+        False,
+        cache_dir=cache_dir,
+    )
+    pot = polib.pofile(str(pot_file), wrapwidth=100000, check_for_duplicates=False)
+    assert list(map(lambda p: p.msgid, pot)) == [
+        "Insert a row at the end",
+        "Remove",
+        "singular",
+    ]
+
+
+def test_create_catalog_with_cache_shared_message(tmp_path):
+    repo = tmp_path / "repo"
+    (repo / "src").mkdir(parents=True)
+    (repo / "locale").mkdir()
+    first = repo / "src" / "a.ts"
+    first.write_text("trans.__('Hello'); // comment from a\n")
+    (repo / "src" / "b.ts").write_text(
+        "trans.__('Hello');\ntrans._n('Hello', 'Hellos', n);\n"
+    )
+
+    def extract(cache_dir=None):
+        pot_file, _ = create_catalog(
+            repo, repo / "locale", "repo", "0.1.0", False, cache_dir=cache_dir
+        )
+        return pot_file.read_text()
+
+    assert "#. comment from a" in extract(tmp_path / "cache")
+
+    # Cached entries of the unchanged file keep their own data only
+    first.write_text("trans.__('Hello');\n")
+    expected = extract()
+    assert "comment from a" not in expected
+    assert extract(tmp_path / "cache") == expected
+
+
+def test_create_catalog_parallel(dummy_pkg, monkeypatch):
+    source = dummy_pkg / "src" / "documentwidget.ts"
+    for name in ("a", "b", "c"):
+        package = dummy_pkg / name / "src"
+        package.mkdir(parents=True)
+        shutil.copy(source, package)
+        (package / "module.py").write_text('trans.__("Python string")\n')
+
+    monkeypatch.setattr(utils, "MIN_FILES_PER_WORKER", 1)
+    outputs = []
+    for jobs in (1, 3):
+        pot_file, _ = create_catalog(
+            dummy_pkg, dummy_pkg / "locale", dummy_pkg.name, "0.1.0", False, jobs=jobs
+        )
+        outputs.append(pot_file.read_text())
+
+    assert outputs[0] == outputs[1]
+    for name in ("a", "b", "c"):
+        assert f"/{name}/src/module.py:1" in outputs[0]
+        assert f"{name}/src/documentwidget.ts:40" in outputs[0]
+
+
+def test_create_catalog_python_engine(dummy_pkg):
+    outputs = []
+    for engine in ("node", "python"):
+        pot_file, _ = create_catalog(
+            dummy_pkg,
+            dummy_pkg / "locale",
+            dummy_pkg.name,
+            "0.1.0",
+            False,
+            engine=engine,
+        )
+        outputs.append(pot_file.read_text())
+
+    assert outputs[0] == outputs[1]
+
+
+def _gettext_config(pattern: str) -> dict:
+    config = json.loads(json.dumps(GETTEXT_CONFIG))
+    config["js"]["glob"]["pattern"] = pattern
+    return config
+
+
+def test_gettext_extract_worker(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.ts").write_text("trans.__('Hello');\n")
+    (tmp_path / "src" / "b.ts").write_text("trans.__('World');\n")
+    (tmp_path / "src" / "broken.ts").symlink_to(tmp_path / "missing.ts")
+
+    worker = gettext_extract.GettextExtractWorker()
+    try:
+        pid = worker._process.pid
+        first = worker.extract(tmp_path, _gettext_config("src/a.ts"))
+        second = worker.extract(tmp_path, _gettext_config("src/b.ts"))
+        assert 'msgid "Hello"' in first and "World" not in first
+        assert 'msgid "World"' in second and "Hello" not in second
+
+        # Errors are replied and the worker keeps serving requests
+        with pytest.raises(RuntimeError, match="ENOENT"):
+            worker.extract(tmp_path, _gettext_config("src/broken.ts"))
+        assert 'msgid "Hello"' in worker.extract(tmp_path, _gettext_config("src/a.ts"))
+        assert worker.alive and worker._process.pid == pid
+    finally:
+        worker.close()
+    assert not worker.alive
+
+
+def test_gettext_extract_reuses_workers(tmp_path, monkeypatch):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.ts").write_text("trans.__('Hello');\n")
+    idle_workers = queue.SimpleQueue()
+    monkeypatch.setattr(gettext_extract, "_idle_workers", idle_workers)
+
+    for _ in range(2):
+        gettext_extract.extract(tmp_path, _gettext_config("src/a.ts"))
+    assert idle_workers.qsize() == 1
+
+    worker = idle_workers.get()
+    idle_workers.put(worker)
+    gettext_extract.shutdown_workers()
+    assert idle_workers.empty()
+    assert not worker.alive
+
+
+def test_tsx_extract():
+    source = """
+const a = trans.__('Open'); // Open a file
+const b = this._trans._n('One %1', "Many " + `%1`, n);
+const c = (
+  <div title={props.trans._p('menu', 'Close')}>
+    Don't {this.props.trans.__(`Save ${name}`)}
+    {trans._np('file', 'Item', 'Items', n)}
+  </div>
+);
+other.trans.__('Not a translation');
+trans.__(label);
+"""
+
+    entries = tsx_extract.extract(source, "src/widget.tsx")
+
+    assert entries == [
+        {
+            "msgid": "One %1",
+            "occurrences": [("src/widget.tsx", "3")],
+            "msgid_plural": "Many %1",
+            "msgstr_plural": {0: "", 1: ""},
+        },
+        {
+            "msgid": "Open",
+            "occurrences": [("src/widget.tsx", "2")],
+            "comment": "Open a file",
+        },
+        {
+            "msgid": "Item",
+            "occurrences": [("src/widget.tsx", "7")],
+            "msgctxt": "file",
+            "msgid_plural": "Items",
+            "msgstr_plural": {0: "", 1: ""},
+        },
+        {"msgid": "Close", "occurrences": [("src/widget.tsx", "5")], "msgctxt": "menu"},
+    ]
+
+
+def test_tsx_engines_repeated_messages(tmp_path):
+    lines = ["// filler"] * 120
+    for line in (1, 3, 9, 10, 21, 100):
+        lines[line - 1] = "trans.__('Hello');"
+    lines.append("trans.__('Nested', trans.__('Hello')); trans.__('Nested');")
+    lines.append("trans._n('One', 'Many', n); trans.__('Hello'); // twice")
+    lines.append("trans._n('One', 'Many', m);")
+    source = tmp_path / "src" / "index.tsx"
+    source.parent.mkdir()
+    source.write_text("\n".join(lines) + "\n")
+
+    entries = {}
+    for engine in TSX_ENGINES:
+        extracted = utils._extract_tsx_entries(
+            tmp_path, [source], [source], engine=engine
+        )[source]
+        entries[engine] = [
+            {k: v for k, v in entry.items() if k != "encoding"} for entry in extracted
+        ]
+
+    assert [o for _, o in entries["python"][0]["occurrences"]] == [
+        "1",
+        "10",
+        "100",
+        "121",
+        "122",
+        "21",
+        "3",
+        "9",
+    ]
+    assert entries["python"] == entries["node"]
+
+
+@pytest.mark.parametrize("use_git", [False, True])
+def test_find_source_files(tmp_path, use_git):
+    for name in (
+        "src/index.ts",
+        "src/widget.tsx",
+        "src/style.css",
+        "module/handler.py",
+        "lib/index.js",
+        "lib/index.d.ts",
+        "node_modules/pkg/index.ts",
+        "src/test/test_handler.py",
+    ):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("")
+    if use_git:
+        subprocess.check_call(["git", "init", "-q", str(tmp_path)])
+
+    files = find_source_files(tmp_path, use_git=use_git)
+
+    assert sorted(f.relative_to(tmp_path).as_posix() for f in files) == [
+        "module/handler.py",
+        "src/index.ts",
+        "src/widget.tsx",
+    ]
+
+
+@pytest.mark.parametrize("use_git", [False, True])
+def test_find_packages_source_files(tmp_path, monkeypatch, use_git):
+    for name in (
+        "mypkg/handler.py",
+        "node_modules/gyp/gyp_main.py",
+        "tests/test_a.py",
+        "lib/x.py",
+    ):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("")
+    if use_git:
+        subprocess.check_call(["git", "init", "-q", str(tmp_path)])
+
+    if use_git:
+        (tmp_path / ".gitignore").write_text("build/\n")
+        (tmp_path / "mypkg" / "build").mkdir()
+        (tmp_path / "mypkg" / "build" / "generated.py").write_text("")
+
+    listings = []
+    git_files = utils._git_files
+    monkeypatch.setattr(
+        utils, "_git_files", lambda p: listings.append(p) or git_files(p)
+    )
+    files = utils.find_packages_source_files(tmp_path, use_git=use_git)
+
+    # The files known to git are listed once for all the packages
+    assert listings == ([tmp_path] if use_git else [])
+    assert {
+        name: [f.relative_to(tmp_path).as_posix() for f in pkg_files]
+        for name, pkg_files in files.items()
+    } == {"mypkg": ["mypkg/handler.py"]}
+
+
+@pytest.mark.parametrize(
+    "files, version",
+    [
+        ({"pyproject.toml": '[project]\nname = "pkg"\nversion = "1.2.3"\n'}, "1.2.3"),
+        (
+            {
+                "pyproject.toml": '[project]\ndynamic = ["version"]\n'
+                '[tool.hatch.version]\npath = "pkg/_version.py"\n',
+                "pkg/_version.py": '__version__ = "2.0.0a1"\n',
+            },
+            "2.0.0a1",
+        ),
+        ({"setup.cfg": "[metadata]\nversion = 3.1\n", "setup.py": ""}, "3.1"),
+        ({"pkg/package.json": '{"version": "4.0.0"}'}, "4.0.0"),
+    ],
+)
+def test_get_version_static(tmp_path, monkeypatch, files, version):
+    for name, content in files.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(content)
+
+    def check_output(args, **kwargs):
+        if args[0] == "git":
+            raise subprocess.CalledProcessError(128, args)
+        raise AssertionError("Static versions must not run subprocesses")
+
+    monkeypatch.setattr(utils.subprocess, "check_output", check_output)
+
+    assert utils.get_version(tmp_path, "pkg") == version
+
+
+def test_relative_paths(tmp_path, monkeypatch):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "link").symlink_to(tmp_path / "pkg")
+    paths = RelativePaths(tmp_path)
+
+    assert paths(tmp_path / "pkg" / "a.py") == "pkg/a.py"
+    assert paths(tmp_path / "link" / "a.py") == "pkg/a.py"
+
+    # Known paths are not resolved again
+    monkeypatch.setattr(Path, "resolve", None)
+    assert paths(str(tmp_path / "pkg" / "a.py")) == "pkg/a.py"
+
+
+def _install_locale_package(site: Path, name: str) -> None:
+    messages = site / name / "locale" / "fr_FR" / "LC_MESSAGES"
+    messages.mkdir(parents=True)
+    (site / name / "__init__.py").write_text("raise RuntimeError('imported')\n")
+    (messages / f"{name}.json").write_text('{"": {"domain": "%s"}}' % name)
+    dist_info = site / f"{name}-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(f"Name: {name}\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        f"[jupyterlab.locale]\n{name.replace('_', '-')} = {name}\n"
+    )
+
+
+def test_get_installed_packages_locale(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    site.mkdir()
+    _install_locale_package(site, "ext_a")
+    monkeypatch.syspath_prepend(str(site))
+
+    assert finder.get_installed_packages_locale("fr_FR") == {
+        "ext_a": {"fr_FR": {"": {"domain": "ext_a"}}}
+    }
+    assert finder.get_installed_packages_locale("es_ES") == {}
+
+    # The discovery is refreshed when distributions are installed
+    _install_locale_package(site, "ext_b")
+    assert sorted(finder.get_installed_packages_locale_folders()) == [
+        "ext_a",
+        "ext_b",
+    ]
+
+
+def _install_language_pack(site: Path) -> Path:
+    pack = "jupyterlab_language_pack_fr_FR"
+    messages = site / pack / "locale" / "fr_FR" / "LC_MESSAGES"
+    messages.mkdir(parents=True)
+    (site / pack / "__init__.py").write_text("")
+    (messages / "jupyterlab.json").write_text('{"": {}, "Open": ["Ouvrir"]}')
+    (messages / "ext_a.json").write_text('{"Close": ["Fermer"]}')
+    dist_info = site / f"{pack}-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(f"Name: {pack}\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        f"[jupyterlab.languagepack]\nfr_FR = {pack}\n"
+    )
+    return messages.parent
+
+
+def test_merge_data(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    site.mkdir()
+    _install_locale_package(site, "ext_a")
+    locale_dir = _install_language_pack(site)
+    monkeypatch.syspath_prepend(str(site))
+
+    expected = {
+        "ext_a": {"": {"domain": "ext_a"}, "Close": ["Fermer"]},
+        "jupyterlab": {"": {}, "Open": ["Ouvrir"]},
+    }
+    assert finder.merge_data("fr_FR", tmp_path / "cache") == expected
+    assert len(list((tmp_path / "cache" / "bundles").glob("fr_FR-*.json"))) == 1
+
+    # Later calls, even in new processes, reuse the merged bundles
+    finder._merged_data.cache_clear()
+    merge_bundles = finder._merge_bundles
+    monkeypatch.setattr(finder, "_merge_bundles", None)
+    assert finder.merge_data("fr_FR", tmp_path / "cache") == expected
+
+    # Rebuilt bundles replace the merged bundles
+    monkeypatch.setattr(finder, "_merge_bundles", merge_bundles)
+    bundle = locale_dir / "LC_MESSAGES" / "jupyterlab.json"
+    bundle.write_text('{"": {}, "Open": ["Ouvre"]}')
+    expected["jupyterlab"]["Open"] = ["Ouvre"]
+    assert finder.merge_data("fr_FR", tmp_path / "cache") == expected
+    assert len(list((tmp_path / "cache" / "bundles").glob("fr_FR-*.json"))) == 1
+
+
+def test_get_bundles_hashes(tmp_path, monkeypatch):
+    site = tmp_path / "site"
+    site.mkdir()
+    _install_locale_package(site, "ext_a")
+    locale_dir = _install_language_pack(site)
+    monkeypatch.syspath_prepend(str(site))
+
+    manifest_path = write_bundles_manifest(locale_dir)
+    manifest = json.loads(manifest_path.read_text())
+    assert sorted(manifest["files"]) == [
+        "LC_MESSAGES/ext_a.json",
+        "LC_MESSAGES/jupyterlab.json",
+    ]
+    bundle = locale_dir / "LC_MESSAGES" / "jupyterlab.json"
+    assert manifest["files"]["LC_MESSAGES/jupyterlab.json"] == {
+        "sha256": hashlib.sha256(bundle.read_bytes()).hexdigest(),
+        "size": bundle.stat().st_size,
+    }
+
+    hashes = finder.get_bundles_hashes("fr_FR")
+    assert sorted(hashes) == ["ext_a", "jupyterlab_language_pack_fr_FR"]
+    assert list(hashes["ext_a"]) == ["ext_a.json"]
+    assert hashes["jupyterlab_language_pack_fr_FR"] == {
+        name.split("/")[-1]: info for name, info in manifest["files"].items()
+    }
+
+    # Bundles rewritten with the same content are not hashed again
+    bundle.write_bytes(bundle.read_bytes())
+    write_bundles_manifest(locale_dir)
+    finder._hash_bundle.cache_clear()
+    assert finder.get_bundles_hashes("fr_FR") == hashes
+    assert finder._hash_bundle.cache_info().currsize == 1  # ext_a has no manifest
+
+    # Bundles changed after the manifest are hashed again
+    bundle.write_text('{"": {}, "Open": ["Ouvre"]}')
+    info = finder.get_bundles_hashes("fr_FR")["jupyterlab_language_pack_fr_FR"]
+    assert info["jupyterlab.json"]["sha256"] == (
+        hashlib.sha256(bundle.read_bytes()).hexdigest()
+    )